@@ -3,35 +3,159 @@ Authentication and authorization with JWT and RBAC.
 Implements secure password hashing and role-based access control.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import asyncio
+import logging
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import timedelta
+from typing import NamedTuple, Optional
+import bcrypt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from jwt import InvalidTokenError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update, func
 
+from . import auth_cache
 from .config import settings
-from .database import get_db
+from .database import get_db, AsyncSessionLocal
 from .models import User
 from .schemas import TokenData
 
-# Password hashing context (bcrypt with cost factor 12)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Argon2id hasher (used when PASSWORD_SCHEME=argon2id; argon2-cffi defaults
+# follow the RFC 9106 low-memory profile)
+_argon2 = PasswordHasher()
+
+# bcrypt/argon2 release the GIL, so hashing on worker threads keeps the event loop free
+_hash_executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="pwhash",
+)
+
+
+class CurrentUser(NamedTuple):
+    """Identity of the authenticated caller, as resolved from a bearer token."""
+    id: int
+    username: str
+    role: str
+
+
+class LoginUser(NamedTuple):
+    """Account fields returned by a successful password login."""
+    id: int
+    username: str
+    role: str
+    full_name: Optional[str]
+
+
+# Active-user lookups, built once so only the bound username changes between
+# calls. Token validation needs just the identity columns, not a full ORM row.
+_LOGIN_USER_BY_NAME = (
+    select(User.id, User.username, User.role, User.full_name, User.password_hash)
+    .where(User.username == bindparam("username"), User.active.is_(True))
+)
+_CURRENT_USER_BY_NAME = (
+    select(User.id, User.username, User.role)
+    .where(User.username == bindparam("username"), User.active.is_(True))
+)
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
 
+# JWT parameters resolved once at import rather than on every encode/decode
+_JWT = jwt.PyJWT()
+_JWT_SECRET = settings.JWT_SECRET_KEY.encode()
+_JWT_ALGORITHM = settings.JWT_ALGORITHM
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+_DEFAULT_TOKEN_LIFETIME = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (bcrypt or argon2id, detected from the hash)."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _argon2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed/unknown hash format
+        return False
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a password with the configured PASSWORD_SCHEME."""
+    if settings.PASSWORD_SCHEME == "argon2id":
+        return _argon2.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(settings.BCRYPT_COST)).decode()
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if a stored hash uses a different scheme or cost than currently configured."""
+    if settings.PASSWORD_SCHEME == "argon2id":
+        return not hashed_password.startswith("$argon2id$") or _argon2.check_needs_rehash(hashed_password)
+
+    # bcrypt hashes look like $2b$12$<salt+hash>
+    parts = hashed_password.split("$")
+    return len(parts) < 4 or not parts[1].startswith("2") or parts[2] != f"{settings.BCRYPT_COST:02d}"
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, get_password_hash, password)
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """
+    Hash verified against when the username is unknown, so failed logins take
+    the same time whether or not the account exists (no user enumeration).
+
+    Built lazily rather than at import so module import stays cheap. Hashes a
+    random per-process secret, so no password can ever match it.
+    """
+    return get_password_hash(secrets.token_urlsafe(32))
+
+
+def _verify_dummy(plain_password: str) -> bool:
+    return verify_password(plain_password, _dummy_hash())
+
+
+def _time_dummy_hash() -> float:
+    start = time.perf_counter()
+    _dummy_hash()
+    return (time.perf_counter() - start) * 1000
+
+
+async def warm_up_password_hashing() -> float:
+    """
+    Build the dummy hash ahead of the first login and time it.
+
+    Runs on the hashing thread pool, so its first worker thread is started
+    before any login or user creation needs it.
+
+    Returns:
+        Milliseconds taken by one hash at the configured scheme/cost
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, _time_dummy_hash)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -45,57 +169,80 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
-    to_encode = data.copy()
-
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    lifetime = expires_delta.total_seconds() if expires_delta else _DEFAULT_TOKEN_LIFETIME
+    to_encode = {**data, "exp": int(time.time() + lifetime)}
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    return _JWT.encode(to_encode, _JWT_SECRET, algorithm=_JWT_ALGORITHM)
 
 
-async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[LoginUser]:
     """
     Authenticate a user by username and password.
 
+    Unknown or inactive usernames still cost one full hash verification (against
+    a dummy hash), so response time doesn't reveal which accounts exist.
+
     Args:
         db: Database session
         username: Username to authenticate
         password: Plain text password
 
     Returns:
-        User object if authentication successful, None otherwise
+        LoginUser if authentication successful, None otherwise
     """
-    stmt = select(User).where(User.username == username, User.active == True)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    result = await db.execute(_LOGIN_USER_BY_NAME, {"username": username})
+    row = result.one_or_none()
 
-    if not user:
+    if row is None:
+        await asyncio.get_running_loop().run_in_executor(_hash_executor, _verify_dummy, password)
         return None
 
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, row.password_hash):
         return None
 
-    # Update last login timestamp
-    user.last_login = datetime.utcnow()
-    await db.commit()
+    # Migrate lazily to the configured scheme/cost while we have the plaintext
+    if password_needs_rehash(row.password_hash):
+        new_hash = await get_password_hash_async(password)
+        await db.execute(update(User).where(User.id == row.id).values(password_hash=new_hash))
+        await db.commit()
 
-    return user
+    return LoginUser(row.id, row.username, row.role, row.full_name)
+
+
+async def warm_up_auth_queries() -> None:
+    """Run the user lookups once so their compiled SQL is cached before the first login."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(_LOGIN_USER_BY_NAME, {"username": ""})
+        await session.execute(_CURRENT_USER_BY_NAME, {"username": ""})
+
+
+async def record_last_login(user_id: int) -> None:
+    """
+    Persist a user's last_login timestamp in its own short-lived session.
+
+    Run as a background task after the login response is sent so the write
+    stays off the login critical path.
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(User).where(User.id == user_id).values(last_login=func.now())
+            )
+            await session.commit()
+    except Exception as exc:
+        logger.warning(f"Failed to record last_login for user {user_id}: {exc}")
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """
     Dependency to get the current authenticated user from JWT token.
 
     Usage:
         @router.get("/protected")
-        async def protected_route(current_user: User = Depends(get_current_user)):
+        async def protected_route(current_user: CurrentUser = Depends(get_current_user)):
             return {"username": current_user.username}
 
     Raises:
@@ -107,27 +254,43 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    token = credentials.credentials
+    cache_key = auth_cache.token_key(token)
+
+    cached_user = auth_cache.get_user(cache_key)
+    if cached_user is not None:
+        return cached_user
+
+    if auth_cache.is_rejected(cache_key):
+        raise credentials_exception
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = _JWT.decode(token, _JWT_SECRET, algorithms=_JWT_ALGORITHMS)
 
         username: str = payload.get("sub")
         if username is None:
+            auth_cache.mark_rejected(cache_key)
             raise credentials_exception
 
         token_data = TokenData(username=username, role=payload.get("role"))
 
-    except JWTError:
+    except InvalidTokenError:
+        auth_cache.mark_rejected(cache_key)
         raise credentials_exception
 
     # Fetch user from database
-    stmt = select(User).where(User.username == token_data.username, User.active == True)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    result = await db.execute(_CURRENT_USER_BY_NAME, {"username": token_data.username})
+    row = result.one_or_none()
 
-    if user is None:
+    if row is None:
+        auth_cache.mark_rejected(cache_key)
         raise credentials_exception
 
+    user = CurrentUser(*row)
+    exp = payload.get("exp")
+    if exp is not None:
+        auth_cache.put_user(cache_key, user, float(exp))
+
     return user
 
 
@@ -141,7 +304,7 @@ def require_role(allowed_roles: list[str]):
     Usage:
         @router.post("/batches/{batch_id}/close")
         async def close_batch(
-            current_user: User = Depends(require_role(["engineer", "admin"]))
+            current_user: CurrentUser = Depends(require_role(["engineer", "admin"]))
         ):
             # Only engineers and admins can access this endpoint
             pass
@@ -149,11 +312,15 @@ def require_role(allowed_roles: list[str]):
     Raises:
         HTTPException: 403 if user's role is not in allowed_roles
     """
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
+    # Resolved once per factory call, not per request
+    allowed = frozenset(allowed_roles)
+    forbidden_detail = f"Insufficient permissions. Required roles: {allowed_roles}"
+
+    async def role_checker(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {allowed_roles}"
+                detail=forbidden_detail
             )
         return current_user
 
@@ -0,0 +1,61 @@
+"""
+In-process caches for bearer-token validation.
+Lets repeat requests with the same token skip JWT decoding and the user lookup.
+"""
+
+import hashlib
+import time
+from typing import Any, Optional
+
+from cachetools import TLRUCache, TTLCache
+
+from .config import settings
+
+# Bumped whenever a user is deleted/deactivated. It is part of every cache key,
+# so one increment orphans all previously cached identities at O(1) cost.
+_generation = 0
+
+
+def _token_ttu(_key: tuple, value: tuple, now: float) -> float:
+    """Expire cached tokens at their `exp` claim, capped by AUTH_CACHE_TTL_SECONDS."""
+    return min(value[1], now + settings.AUTH_CACHE_TTL_SECONDS)
+
+
+# Verified tokens: (generation, sha256(token)) -> (user, exp)
+_verified = TLRUCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttu=_token_ttu, timer=time.time)
+
+# Recently rejected tokens: sha256(token) -> True. Repeat bad tokens are refused
+# with a dict lookup instead of another HMAC pass (blunts token spraying).
+_rejected = TTLCache(maxsize=50_000, ttl=60)
+
+
+def token_key(token: str) -> bytes:
+    """Fixed-size cache key for a raw bearer token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get_user(key: bytes) -> Optional[Any]:
+    """Return the cached user for a verified token, or None on a miss."""
+    entry = _verified.get((_generation, key))
+    return entry[0] if entry is not None else None
+
+
+def put_user(key: bytes, user: Any, exp: float) -> None:
+    """Cache the user resolved from a verified token until `exp` (epoch seconds)."""
+    _verified[(_generation, key)] = (user, exp)
+
+
+def is_rejected(key: bytes) -> bool:
+    """True if this token failed validation recently."""
+    return key in _rejected
+
+
+def mark_rejected(key: bytes) -> None:
+    """Remember a token that failed validation."""
+    _rejected[key] = True
+
+
+def invalidate() -> None:
+    """Forget all cached identities (call after deleting or deactivating a user)."""
+    global _generation
+    _generation += 1
@@ -3,8 +3,10 @@ Application configuration using Pydantic Settings.
 Loads configuration from environment variables.
 """
 
+from functools import cached_property
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Literal, Tuple, Union
 
 
 class Settings(BaseSettings):
@@ -17,13 +19,31 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "pichia_api"
     POSTGRES_PASSWORD: str
 
+    # Connection pool
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False  # Extra SELECT 1 per checkout; /health/ready checks the DB instead
+    DB_BEHIND_PGBOUNCER: bool = False  # Disables asyncpg prepared-statement cache
+    DB_NULL_POOL: bool = False  # One connection per session, for short-lived worker processes
+
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
 
-    # CORS
-    ALLOWED_ORIGINS: str = "http://localhost:3000"
+    # Password hashing. New hashes use PASSWORD_SCHEME; existing hashes are
+    # migrated on the user's next successful login.
+    PASSWORD_SCHEME: Literal["bcrypt", "argon2id"] = "bcrypt"
+    BCRYPT_COST: int = 12  # bcrypt work factor; each +1 doubles hash time
+
+    # Verified-token cache (per process)
+    AUTH_CACHE_MAXSIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # CORS - comma-separated in the environment, parsed once at load.
+    # (Union with str stops pydantic-settings JSON-decoding the raw value.)
+    ALLOWED_ORIGINS: Union[Tuple[str, ...], str] = ("http://localhost:3000",)
 
     # API
     API_V1_PREFIX: str = "/api/v1"
@@ -33,7 +53,8 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
 
-    @property
+    # Derived values are computed on first access and cached (settings never change)
+    @cached_property
     def DATABASE_URL(self) -> str:
         """Construct async PostgreSQL URL."""
         return (
@@ -41,7 +62,7 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
-    @property
+    @cached_property
     def DATABASE_URL_SYNC(self) -> str:
         """Construct sync PostgreSQL URL (for Alembic)."""
         return (
@@ -49,10 +70,13 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
-    @property
-    def ALLOWED_ORIGINS_LIST(self) -> List[str]:
-        """Convert comma-separated CORS origins to list."""
-        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @classmethod
+    def split_allowed_origins(cls, v):
+        """Convert comma-separated CORS origins to a tuple."""
+        if isinstance(v, str):
+            return tuple(origin.strip() for origin in v.split(",") if origin.strip())
+        return v
 
     class Config:
         env_file = ".env"
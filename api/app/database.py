@@ -3,17 +3,35 @@ Database connection and session management.
 Uses async SQLAlchemy for optimal performance.
 """
 
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from .config import settings
 
+if settings.DB_NULL_POOL:
+    # Short-lived workers: nothing outlives the session, so there's no pool to size
+    _pool_options = {"poolclass": NullPool}
+else:
+    # Bounded explicitly: at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections per worker
+    _pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_use_lifo": True,  # Reuse the warmest connection first
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before using
+    # PgBouncer (transaction mode) can't track per-connection prepared statements
+    connect_args={"statement_cache_size": 0} if settings.DB_BEHIND_PGBOUNCER else {},
+    **_pool_options,
 )
 
 # Session factory
@@ -28,6 +46,19 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for ORM models
 Base = declarative_base()
 
+# PostgreSQL SQLSTATE for foreign_key_violation
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """
+    True if a write referenced a parent row that doesn't exist.
+
+    Lets child-record inserts rely on the batch_id foreign key for the
+    "batch exists" check instead of a separate SELECT beforehand.
+    """
+    return getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+
 
 async def get_db() -> AsyncSession:
     """
@@ -43,3 +74,20 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def check_connection() -> None:
+    """Round-trip a trivial query; raises if the database is unreachable."""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_up_pool() -> None:
+    """
+    Open the pool's base connections up front so the first requests after a
+    deploy don't pay TCP/TLS/auth setup to PostgreSQL. No-op without a pool.
+    """
+    if settings.DB_NULL_POOL:
+        return
+
+    await asyncio.gather(*(check_connection() for _ in range(settings.DB_POOL_SIZE)))
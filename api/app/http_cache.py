@@ -0,0 +1,55 @@
+"""
+Conditional GET support (ETag / If-None-Match).
+Lets polling clients revalidate with a cheap version query instead of
+re-downloading records that haven't changed.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, bindparam, func, select
+
+# Authenticated data: browsers may keep it, but must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*version: Any) -> str:
+    """Strong ETag for a tuple of version values (row xmin, counts, max ids...)."""
+    digest = hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def append_only_version(model) -> Select:
+    """
+    Version query for one batch's list of `model` child records.
+
+    Child records are append-only through the API (no update or delete
+    routes), so any change to the list changes its (count, max id).
+    """
+    return select(func.count(), func.max(model.id)).where(model.batch_id == bindparam("batch_id"))
+
+
+def is_fresh(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Build a fresh 304 response (Response objects must not be shared between requests)."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach validator headers to a full (200) response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
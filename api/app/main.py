@@ -3,15 +3,21 @@ Main FastAPI application entry point.
 Configures middleware, CORS, error handlers, and routes.
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+from functools import lru_cache
 import logging
+import time
+
+import orjson
 
 from .config import settings
+from .responses import ORJSONResponse
+from .auth import warm_up_password_hashing, warm_up_auth_queries
+from .database import check_connection, warm_up_pool
 from .routers import batches, calibrations, inoculations, media, samples, failures, closures, auth
 
 # Configure logging
@@ -29,15 +35,17 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS_LIST,
+    allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],  # list_batches pagination, conditional GETs
 )
 
 
@@ -45,31 +53,64 @@ app.add_middleware(
 # EXCEPTION HANDLERS
 # ============================================================================
 
-@app.exception_handler(RequestValidationError)
-async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    """Handle Pydantic validation errors with detailed messages."""
-    # Convert errors to JSON-serializable format
-    errors = []
-    for error in exc.errors():
-        error_dict = error.copy()
-        # Convert any non-serializable types to strings
-        if 'input' in error_dict and isinstance(error_dict['input'], bytes):
-            error_dict['input'] = error_dict['input'].decode('utf-8', errors='replace')
-        errors.append(error_dict)
-    
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+@lru_cache(maxsize=1)
+def _utc_timestamp(epoch_second: int) -> str:
+    """ISO timestamp for error bodies, formatted once per second."""
+    return datetime.utcfromtimestamp(epoch_second).isoformat()
+
+
+@lru_cache(maxsize=256)
+def _bare_error_body(status_code: int, message: str, path: str, epoch_second: int) -> bytes:
+    """Serialized envelope for a detail-less error; repeats within a second reuse it."""
+    return orjson.dumps({
+        "status": "error",
+        "code": status_code,
+        "message": message,
+        "detail": None,
+        "timestamp": _utc_timestamp(epoch_second),
+        "path": path
+    })
+
+
+def _error_response(status_code: int, message: str, detail, request: Request) -> Response:
+    """Build the standard error envelope (see schemas.ErrorResponse)."""
+    epoch_second = int(time.time())
+    if detail is None:
+        return Response(
+            _bare_error_body(status_code, message, request.url.path, epoch_second),
+            status_code=status_code,
+            media_type="application/json"
+        )
+
+    return ORJSONResponse(
+        status_code=status_code,
         content={
             "status": "error",
-            "code": 422,
-            "message": "Validation error",
-            "detail": errors,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url.path)
+            "code": status_code,
+            "message": message,
+            "detail": detail,
+            "timestamp": _utc_timestamp(epoch_second),
+            "path": request.url.path
         }
     )
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Handle Pydantic validation errors with detailed messages."""
+    errors = exc.errors()
+
+    # Raw bytes bodies aren't JSON-serializable; decode them (copying only those errors)
+    if any(isinstance(error.get('input'), bytes) for error in errors):
+        errors = [
+            {**error, 'input': error['input'].decode('utf-8', errors='replace')}
+            if isinstance(error.get('input'), bytes) else error
+            for error in errors
+        ]
+
+    return _error_response(status.HTTP_422_UNPROCESSABLE_ENTITY, "Validation error", errors, request)
+
+
 @app.exception_handler(IntegrityError)
 async def integrity_exception_handler(request: Request, exc: IntegrityError):
     """Handle database integrity constraint violations."""
@@ -88,17 +129,7 @@ async def integrity_exception_handler(request: Request, exc: IntegrityError):
     elif "one_closure_per_batch" in error_msg:
         message = "Batch closure already recorded"
 
-    return JSONResponse(
-        status_code=status.HTTP_409_CONFLICT,
-        content={
-            "status": "error",
-            "code": 409,
-            "message": message,
-            "detail": {"database_error": error_msg},
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url.path)
-        }
-    )
+    return _error_response(status.HTTP_409_CONFLICT, message, {"database_error": error_msg}, request)
 
 
 @app.exception_handler(Exception)
@@ -106,17 +137,8 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Catch-all handler for unhandled exceptions."""
     logger.exception(f"Unhandled exception: {exc}")
 
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "status": "error",
-            "code": 500,
-            "message": "Internal server error",
-            "detail": {"error": str(exc)} if settings.DEBUG else None,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url.path)
-        }
-    )
+    detail = {"error": str(exc)} if settings.DEBUG else None
+    return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error", detail, request)
 
 
 # ============================================================================
@@ -128,15 +150,22 @@ async def health_check():
     """Basic health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.utcnow(),
         "version": "1.0.0"
     }
 
 
 @app.get("/health/ready", tags=["health"])
 async def readiness_check():
-    """Kubernetes readiness probe."""
-    # TODO: Add database connection check
+    """Kubernetes readiness probe (fails while the database is unreachable)."""
+    try:
+        await check_connection()
+    except Exception as exc:
+        logger.warning(f"Readiness check failed: {exc}")
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": "unreachable"}
+        )
     return {"status": "ready"}
 
 
@@ -167,6 +196,24 @@ async def startup_event():
     logger.info(f"Starting {settings.PROJECT_NAME}")
     logger.info(f"API documentation available at {settings.API_V1_PREFIX}/docs")
 
+    # Fill the connection pool before traffic arrives
+    try:
+        await warm_up_pool()
+        await warm_up_auth_queries()
+    except Exception as exc:
+        logger.warning(f"Database warm-up failed (continuing with a cold pool): {exc}")
+
+    # Pre-build the login dummy hash, and check the bcrypt cost suits this
+    # hardware (target ~150-400 ms per hash)
+    hash_ms = await warm_up_password_hashing()
+    if settings.PASSWORD_SCHEME == "bcrypt" and not 150 <= hash_ms <= 400:
+        logger.warning(
+            f"bcrypt cost {settings.BCRYPT_COST} takes {hash_ms:.0f} ms per hash "
+            f"(target 150-400 ms); consider adjusting BCRYPT_COST"
+        )
+    else:
+        logger.info(f"{settings.PASSWORD_SCHEME} takes {hash_ms:.0f} ms per hash")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -1,14 +1,18 @@
 """
 SQLAlchemy ORM models for manual data collection.
 Matches the database schema in database/init.sql
+
+Measurement columns on calibrations, inoculations, samples and closures are
+declared with asdecimal=False, so they load as float and the exporters can
+emit them without per-field conversion.
 """
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, Text, ForeignKey,
-    DateTime, CheckConstraint, UniqueConstraint, CHAR, DECIMAL
+    DateTime, CheckConstraint, UniqueConstraint, Index, CHAR, DECIMAL, Numeric, cast, extract, text
 )
 from sqlalchemy.dialects.postgresql import UUID, INET, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
@@ -36,6 +40,12 @@ class Batch(Base):
 
     notes = Column(Text)
 
+    # Hours from inoculation to completion, rounded to 2 dp (NULL until both are set).
+    # Computed by Postgres in the same SELECT/RETURNING that loads the row.
+    runtime_hours = column_property(
+        cast(func.round(cast(extract("epoch", completed_at - inoculated_at) / 3600, Numeric), 2), Float)
+    )
+
     # Relationships
     media_prep = relationship("MediaPreparation", back_populates="batch", uselist=False, cascade="all, delete-orphan")
     calibrations = relationship("Calibration", back_populates="batch", cascade="all, delete-orphan")
@@ -50,6 +60,15 @@ class Batch(Base):
         CheckConstraint("phase IN ('A', 'B', 'C')", name="check_phase"),
         CheckConstraint("status IN ('pending', 'running', 'complete', 'aborted')", name="check_status"),
         UniqueConstraint("batch_number", "phase", name="unique_batch_per_phase"),
+        # Indexes (see database/migrations/003_*.sql and 004_*.sql)
+        Index("idx_batches_phase_status_created", "phase", "status", created_at.desc(), batch_id.desc()),
+        Index("idx_batches_status", "status"),
+        Index("idx_batches_vessel_created", "vessel_id", created_at.desc(), batch_id.desc()),
+        Index(
+            "idx_batches_vessel_active", "vessel_id",
+            postgresql_where=text("status IN ('pending', 'running')")
+        ),
+        Index("idx_batches_created_at_id", created_at.desc(), batch_id.desc()),
     )
 
 
@@ -107,17 +126,17 @@ class Calibration(Base):
     probe_type = Column(String(20), nullable=False)
 
     # 2-point calibration
-    buffer_low_value = Column(DECIMAL(6, 2))
+    buffer_low_value = Column(DECIMAL(6, 2, asdecimal=False))
     buffer_low_lot = Column(String(50))
-    buffer_high_value = Column(DECIMAL(6, 2))
+    buffer_high_value = Column(DECIMAL(6, 2, asdecimal=False))
     buffer_high_lot = Column(String(50))
-    reading_low = Column(DECIMAL(8, 3))
-    reading_high = Column(DECIMAL(8, 3))
+    reading_low = Column(DECIMAL(8, 3, asdecimal=False))
+    reading_high = Column(DECIMAL(8, 3, asdecimal=False))
 
     # Performance
-    slope_percent = Column(DECIMAL(5, 2))  # Auto-calculated for pH
+    slope_percent = Column(DECIMAL(5, 2, asdecimal=False))  # Auto-calculated for pH
     response_time_sec = Column(Integer)  # For DO
-    drift_from_previous = Column(DECIMAL(5, 2))
+    drift_from_previous = Column(DECIMAL(5, 2, asdecimal=False))
 
     # Pass/fail
     pass_ = Column("pass", Boolean, nullable=False)
@@ -136,6 +155,8 @@ class Calibration(Base):
             "probe_type IN ('pH', 'DO', 'Temp', 'OffGas_O2', 'OffGas_CO2', 'Pressure')",
             name="check_probe_type"
         ),
+        # Inoculation pre-check looks up only the failing probes of a batch
+        Index("idx_calibrations_failed", "batch_id", postgresql_where=text("pass = false")),
     )
 
 
@@ -151,9 +172,9 @@ class Inoculation(Base):
     inoculum_source = Column(String(200))  # Was cryo_vial_id - now flexible
 
     # OD measurements (relaxed constraints for flexibility)
-    inoculum_od600 = Column(DECIMAL(6, 3), nullable=False)
-    dilution_factor = Column(DECIMAL(6, 2), default=1.0)
-    inoculum_volume_ml = Column(DECIMAL(6, 2), default=100.0)
+    inoculum_od600 = Column(DECIMAL(6, 3, asdecimal=False), nullable=False)
+    dilution_factor = Column(DECIMAL(6, 2, asdecimal=False), default=1.0)
+    inoculum_volume_ml = Column(DECIMAL(6, 2, asdecimal=False), default=100.0)
 
     # Quality
     microscopy_observations = Column(Text)
@@ -180,21 +201,21 @@ class Sample(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     batch_id = Column(UUID(as_uuid=True), ForeignKey("batches.batch_id", ondelete="CASCADE"), nullable=False)
 
-    timepoint_hours = Column(DECIMAL(6, 2))  # Auto-calculated by trigger
+    timepoint_hours = Column(DECIMAL(6, 2, asdecimal=False))  # Auto-calculated by trigger
 
-    sample_volume_ml = Column(DECIMAL(6, 2), default=10.0)
+    sample_volume_ml = Column(DECIMAL(6, 2, asdecimal=False), default=10.0)
 
     # OD600
-    od600_raw = Column(DECIMAL(8, 4), nullable=False)
-    od600_dilution_factor = Column(DECIMAL(6, 2), default=1.0)
-    od600_calculated = Column(DECIMAL(8, 4))  # Auto-calculated by trigger
+    od600_raw = Column(DECIMAL(8, 4, asdecimal=False), nullable=False)
+    od600_dilution_factor = Column(DECIMAL(6, 2, asdecimal=False), default=1.0)
+    od600_calculated = Column(DECIMAL(8, 4, asdecimal=False))  # Auto-calculated by trigger
 
     # DCW
     dcw_filter_id = Column(String(100))
-    dcw_sample_volume_ml = Column(DECIMAL(6, 2))
-    dcw_filter_wet_weight_g = Column(DECIMAL(8, 4))
-    dcw_filter_dry_weight_g = Column(DECIMAL(8, 4))
-    dcw_g_per_l = Column(DECIMAL(8, 3))  # Auto-calculated by trigger
+    dcw_sample_volume_ml = Column(DECIMAL(6, 2, asdecimal=False))
+    dcw_filter_wet_weight_g = Column(DECIMAL(8, 4, asdecimal=False))
+    dcw_filter_dry_weight_g = Column(DECIMAL(8, 4, asdecimal=False))
+    dcw_g_per_l = Column(DECIMAL(8, 3, asdecimal=False))  # Auto-calculated by trigger
 
     # Quality
     contamination_detected = Column(Boolean, default=False)
@@ -290,16 +311,16 @@ class BatchClosure(Base):
     batch_id = Column(UUID(as_uuid=True), ForeignKey("batches.batch_id", ondelete="CASCADE"), nullable=False)
 
     # Final metrics
-    final_od600 = Column(DECIMAL(8, 4))
-    total_runtime_hours = Column(DECIMAL(6, 2))
-    glycerol_depletion_time_hours = Column(DECIMAL(6, 2))
+    final_od600 = Column(DECIMAL(8, 4, asdecimal=False))
+    total_runtime_hours = Column(DECIMAL(6, 2, asdecimal=False))
+    glycerol_depletion_time_hours = Column(DECIMAL(6, 2, asdecimal=False))
 
     # DO spike
     do_spike_observed = Column(Boolean, default=True)
-    max_do_percent = Column(DECIMAL(5, 2))
+    max_do_percent = Column(DECIMAL(5, 2, asdecimal=False))
 
     # Consumables
-    cumulative_base_addition_ml = Column(DECIMAL(8, 2))
+    cumulative_base_addition_ml = Column(DECIMAL(8, 2, asdecimal=False))
 
     # Outcome
     outcome = Column(String(50), nullable=False)
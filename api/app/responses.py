@@ -0,0 +1,48 @@
+"""
+JSON response helpers.
+orjson encodes UUID/datetime natively; Decimal needs a fallback.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> str:
+    """orjson fallback for types it can't encode natively."""
+    if isinstance(obj, Decimal):
+        # As a string, like Pydantic's JSON mode, so no precision is lost
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    ORJSONResponse that also encodes Decimal.
+
+    Response models already serialize Decimal fields, but hand-built bodies
+    (e.g. validation errors whose context carries a Decimal bound like
+    `ge=Decimal("0.1")`) would otherwise fail to encode.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def model_response(model: BaseModel, **dump_options: Any) -> Response:
+    """
+    Serialize an already-validated response model straight to JSON.
+
+    pydantic-core writes the bytes in one pass; returning a Response makes
+    FastAPI skip re-validating against response_model (which stays on the
+    route for the OpenAPI schema). Aliases are used, as FastAPI would.
+    """
+    return Response(model.model_dump_json(by_alias=True, **dump_options), media_type="application/json")
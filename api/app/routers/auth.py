@@ -3,18 +3,45 @@ Authentication endpoints.
 Handles user login, token generation, and admin user management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.dialects.postgresql import insert
 
+from .. import auth_cache
 from ..database import get_db
 from ..schemas import LoginRequest, Token, UserResponse, UserCreate
-from ..auth import authenticate_user, create_access_token, get_password_hash, require_admin
+from ..auth import (
+    authenticate_user, create_access_token, get_password_hash_async, require_admin,
+    record_last_login, CurrentUser
+)
 from ..models import User
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from typing import List
 
 router = APIRouter()
 
+# User-management statements, built once so only bound values change per request
+# Only UserResponse's columns, as plain rows (never the password hash)
+_ALL_USERS = select(User.id, User.username, User.role, User.full_name, User.active).order_by(User.username)
+_DELETE_USER = (
+    delete(User)
+    .where(User.username == bindparam("username"))
+    .returning(User.id)
+    .execution_options(synchronize_session=False)
+)
+
+# list_users serializes the whole list in one pydantic-core pass, skipping
+# FastAPI's per-item response_model validation
+_USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+
+
+# login's AuthResponse body around its two dynamic parts (token, user), in
+# AuthResponse field order; the model stays on the route for the OpenAPI schema
+_LOGIN_BODY_PREFIX = b'{"access_token":"'
+_LOGIN_BODY_MIDDLE = b'","token_type":"bearer","user":'
+
 
 class AuthResponse(BaseModel):
     """Authentication response with token and user info."""
@@ -26,6 +53,7 @@ class AuthResponse(BaseModel):
 @router.post("/auth/login", response_model=AuthResponse)
 async def login(
     login_request: LoginRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -35,6 +63,7 @@ async def login(
     1. Validate username and password
     2. Generate JWT token with user claims
     3. Return token and user information for authenticated requests
+    4. Record last_login in the background
 
     **Example:**
     ```bash
@@ -55,15 +84,25 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # last_login is bookkeeping only - write it after the response is sent
+    background_tasks.add_task(record_last_login, user.id)
+
     # Create access token with user claims
     access_token = create_access_token(
         data={"sub": user.username, "role": user.role}
     )
 
-    return AuthResponse(
-        access_token=access_token,
-        token_type="bearer",
-        user=UserResponse.from_orm(user)
+    user_json = orjson.dumps({
+        "user_id": user.id,
+        "username": user.username,
+        "role": user.role,
+        "full_name": user.full_name,
+        "active": True  # authenticate_user only matches active accounts
+    })
+    # JWTs are base64url segments joined by dots, so the token needs no escaping
+    return Response(
+        _LOGIN_BODY_PREFIX + access_token.encode() + _LOGIN_BODY_MIDDLE + user_json + b"}",
+        media_type="application/json"
     )
 
 
@@ -71,7 +110,7 @@ async def login(
 async def create_user(
     user_in: UserCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: CurrentUser = Depends(require_admin)
 ):
     """
     Create a new user account (admin only).
@@ -91,55 +130,54 @@ async def create_user(
       }'
     ```
     """
-    # Check if username already exists
-    stmt = select(User).where(User.username == user_in.username)
+    # Single round-trip: the UNIQUE(username) constraint decides conflicts,
+    # so there's no SELECT-then-INSERT race between concurrent admins
+    stmt = (
+        insert(User)
+        .values(
+            username=user_in.username,
+            password_hash=await get_password_hash_async(user_in.password),
+            role=user_in.role,
+            full_name=user_in.full_name,
+            active=True
+        )
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User)
+    )
     result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
+    new_user = result.scalar_one_or_none()
 
-    if existing:
+    if new_user is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Username '{user_in.username}' already exists"
         )
 
-    # Create new user
-    new_user = User(
-        username=user_in.username,
-        password_hash=get_password_hash(user_in.password),
-        role=user_in.role,
-        full_name=user_in.full_name,
-        active=True
-    )
-
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
-    return new_user
+    return UserResponse.from_orm_fast(new_user)
 
 
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: CurrentUser = Depends(require_admin)
 ):
     """
     List all users (admin only).
 
     **Required role:** admin
     """
-    stmt = select(User).order_by(User.username)
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-
-    return users
+    result = await db.execute(_ALL_USERS)
+    content = _USER_LIST_ADAPTER.dump_json([UserResponse.from_orm_fast(row) for row in result])
+    return Response(content=content, media_type="application/json")
 
 
 @router.delete("/users/{username}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     username: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: CurrentUser = Depends(require_admin)
 ):
     """
     Delete a user account (admin only).
@@ -155,15 +193,12 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
 
-    # Find user
-    stmt = select(User).where(User.username == username)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    deleted_id = await db.scalar(_DELETE_USER, {"username": username})
 
-    if not user:
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    await db.delete(user)
     await db.commit()
+    auth_cache.invalidate()
 
     return None
@@ -3,30 +3,160 @@ Batch management endpoints.
 CRUD operations for batch records.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import Response, PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from sqlalchemy import String, and_, bindparam, delete, func, insert, literal_column, or_, select, tuple_, update
+from sqlalchemy.orm import raiseload, selectinload
+from typing import AsyncIterator, FrozenSet, List, Literal, NamedTuple, Optional, Tuple, Union
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+from operator import attrgetter
+import base64
 import csv
 from io import StringIO
-
-from ..database import get_db
-from ..models import Batch, User, Sample, Calibration, Inoculation, Failure, BatchClosure
-from ..schemas import BatchCreate, BatchResponse, BatchUpdate
-from ..auth import get_current_user, require_technician
+import asyncio
+import time
+
+from cachetools import TTLCache
+import orjson
+from pydantic import TypeAdapter
+
+from ..database import get_db, AsyncSessionLocal
+from ..models import Batch, Sample, Calibration, Failure
+from ..schemas import (
+    BatchCreate, BatchDetailResponse, BatchListItem, BatchResponse, BatchUpdate,
+    CalibrationResponse, DeviationLevel, FailureResponse, Phase, SampleResponse
+)
+from ..auth import get_current_user, require_technician, CurrentUser
+from ..http_cache import is_fresh, make_etag, not_modified, set_etag
+from ..responses import model_response
+from ..singleflight import SingleFlight
+from .common import batch_status
 
 router = APIRouter()
 
+# Batch lookups, built once so only the bound batch_id changes between requests.
+# Non-export endpoints serialize Batch columns only; raiseload("*") makes any
+# relationship they didn't explicitly load fail loudly instead of lazy-loading.
+_BATCH_BY_ID = select(Batch).where(Batch.batch_id == bindparam("batch_id"))
+_BATCH_ONLY_BY_ID = _BATCH_BY_ID.options(raiseload("*"))
+# BatchResponse's child counts as correlated subqueries, labelled by field name,
+# so they come back in the same row as the batch (each is an index-only count
+# on the child table's batch_id index)
+_BATCH_COUNTS = (
+    select(func.count()).where(Sample.batch_id == Batch.batch_id)
+    .scalar_subquery().label("total_samples_count"),
+    select(func.count()).where(Calibration.batch_id == Batch.batch_id)
+    .scalar_subquery().label("calibrations_count"),
+    select(func.count())
+    .where(Failure.batch_id == Batch.batch_id, Failure.deviation_level == DeviationLevel.CRITICAL)
+    .scalar_subquery().label("critical_failures_count"),
+)
+_BATCH_WITH_COUNTS_BY_ID = (
+    select(Batch, *_BATCH_COUNTS)
+    .where(Batch.batch_id == bindparam("batch_id"))
+    .options(raiseload("*"))
+)
+# get_batch's validator and child counts in one row. xmin changes on every
+# UPDATE of the batch; child records are append-only through the API, so their
+# counts change whenever they do.
+_BATCH_VERSION_BY_ID = (
+    select(
+        literal_column("batches.xmin").label("row_version"),
+        Batch.inoculated_at,
+        *_BATCH_COUNTS,
+        select(func.count()).where(Failure.batch_id == Batch.batch_id)
+        .scalar_subquery().label("failure_count"),
+    )
+    .where(Batch.batch_id == bindparam("batch_id"))
+)
+
+# Child collections get_batch can embed via ?include=, each batch-loaded with
+# one SELECT ... WHERE batch_id IN (...) and sorted like its list endpoint
+_INCLUDABLE = {
+    "samples": (selectinload(Batch.samples), None, SampleResponse),  # relationship orders by timepoint_hours
+    "calibrations": (selectinload(Batch.calibrations), attrgetter("calibrated_at"), CalibrationResponse),
+    "failures": (selectinload(Batch.failures), attrgetter("reported_at"), FailureResponse),
+}
+# Transaction-scoped advisory lock per vessel: concurrent creates for the same
+# vessel queue up here (released on commit/rollback); other vessels don't wait
+_LOCK_VESSEL = select(
+    func.pg_advisory_xact_lock(func.hashtextextended(bindparam("lock_key", type_=String), 0))
+)
+_DELETE_UNLESS_COMPLETE = (
+    delete(Batch)
+    .where(Batch.batch_id == bindparam("batch_id"), Batch.status != "complete")
+    .returning(Batch.batch_id)
+    .execution_options(synchronize_session=False)  # Nothing to sync; no rows are loaded
+)
+
+# Relationship loading per export format. CSV streams samples separately, so it
+# needs the batch row alone; markdown/JSON render every child record except
+# media prep, which no exporter uses.
+_CSV_EXPORT_OPTIONS = (raiseload("*"),)
+_REPORT_EXPORT_OPTIONS = (
+    selectinload(Batch.calibrations),
+    selectinload(Batch.inoculation),
+    selectinload(Batch.samples),
+    selectinload(Batch.failures),
+    selectinload(Batch.closure),
+    raiseload("*"),
+)
+_CSV_EXPORT_BY_ID = _BATCH_BY_ID.options(*_CSV_EXPORT_OPTIONS)
+_REPORT_EXPORT_BY_ID = _BATCH_BY_ID.options(*_REPORT_EXPORT_OPTIONS)
+
+# list_batches copies ORM rows into BatchResponse unvalidated and serializes
+# straight to JSON bytes, skipping FastAPI's response_model pass
+_BATCH_LIST_ADAPTER = TypeAdapter(List[BatchResponse])
+
+
+class _Report(NamedTuple):
+    """A rendered Markdown/JSON export plus what's needed to serve it."""
+    content: Union[str, bytes]
+    batch_number: int
+    phase: str
+    complete: bool
+
+
+# Identical concurrent Markdown/JSON exports share one load + render
+_report_flights = SingleFlight()
+
+# Reports of completed batches, keyed by (batch_id, format). A completed batch
+# only changes through update_batch (notes/operator), which evicts its entries.
+_completed_reports = TTLCache(maxsize=256, ttl=30)
+
+
+def _evict_reports(batch_id: UUID) -> None:
+    """Drop cached reports for a batch after it changes."""
+    for format in ("markdown", "json"):
+        _completed_reports.pop((batch_id, format), None)
+
+
+def _timepoint_hours(inoculated_at: Optional[datetime], now: datetime) -> Optional[float]:
+    """Hours since inoculation (T=0), to 0.01 h; None before inoculation."""
+    if inoculated_at is None:
+        return None
+    return round((now - inoculated_at).total_seconds() / 3600, 2)
+
+
+def _batch_response(row, now: datetime) -> BatchResponse:
+    """BatchResponse from a (Batch, *_BATCH_COUNTS) result row."""
+    batch = row.Batch
+    return BatchResponse.from_orm_fast(
+        batch,
+        current_timepoint_hours=_timepoint_hours(batch.inoculated_at, now),
+        total_samples_count=row.total_samples_count,
+        calibrations_count=row.calibrations_count,
+        critical_failures_count=row.critical_failures_count,
+    )
+
 
 @router.post("/batches", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
 async def create_batch(
     batch_in: BatchCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """
     Create a new batch record.
@@ -40,64 +170,68 @@ async def create_batch(
     - Sets batch status to 'pending'
     - Waits for media prep, calibrations, and inoculation
     """
-    # Check for duplicate batch number in phase
-    stmt = select(Batch).where(
-        Batch.batch_number == batch_in.batch_number,
-        Batch.phase == batch_in.phase
+    # Without the lock, two creates for an idle vessel could both pass the
+    # active-batch check below and both insert
+    await db.execute(_LOCK_VESSEL, {"lock_key": f"batch:vessel:{batch_in.vessel_id}"})
+
+    # Duplicate batch number and busy vessel are checked in one round-trip;
+    # only the columns needed to tell the two conflicts apart are selected
+    stmt = select(Batch.batch_number, Batch.phase).where(
+        or_(
+            and_(Batch.batch_number == batch_in.batch_number, Batch.phase == batch_in.phase),
+            and_(Batch.vessel_id == batch_in.vessel_id, Batch.status.in_(["pending", "running"]))
+        )
     )
     result = await db.execute(stmt)
-    existing_batch = result.scalar_one_or_none()
+    conflicts = result.all()
 
-    if existing_batch:
+    if any(row.batch_number == batch_in.batch_number and row.phase == batch_in.phase for row in conflicts):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Batch {batch_in.batch_number} already exists in Phase {batch_in.phase}"
         )
 
-    # Check vessel availability
-    stmt = select(Batch).where(
-        Batch.vessel_id == batch_in.vessel_id,
-        Batch.status.in_(["pending", "running"])
-    )
-    result = await db.execute(stmt)
-    active_batch = result.scalar_one_or_none()
-
-    if active_batch:
+    # Any remaining conflict is an active batch on the requested vessel
+    if conflicts:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Vessel {batch_in.vessel_id} has active batch #{active_batch.batch_number}"
+            detail=f"Vessel {batch_in.vessel_id} has active batch #{conflicts[0].batch_number}"
         )
 
-    # Create batch
-    batch = Batch(
-        batch_number=batch_in.batch_number,
-        phase=batch_in.phase,
-        vessel_id=batch_in.vessel_id,
-        operator_id=batch_in.operator_id,
-        notes=batch_in.notes,
-        status="pending",
-        created_by=current_user.username
+    # Create batch; RETURNING hands back server defaults (created_at) without
+    # a follow-up SELECT
+    stmt = (
+        insert(Batch)
+        .values(
+            batch_number=batch_in.batch_number,
+            phase=batch_in.phase,
+            vessel_id=batch_in.vessel_id,
+            operator_id=batch_in.operator_id,
+            notes=batch_in.notes,
+            status="pending",
+            created_by=current_user.username
+        )
+        .returning(Batch, Batch.runtime_hours)  # column_properties aren't in RETURNING by default
     )
-
-    db.add(batch)
+    batch = await db.scalar(stmt)
     await db.commit()
-    await db.refresh(batch)
 
     return batch
 
 
-@router.get("/batches", response_model=List[BatchResponse])
+@router.get("/batches", response_model=List[BatchListItem])
 async def list_batches(
-    phase: Optional[str] = Query(None, regex="^[ABC]$"),
-    status: Optional[str] = Query(None, regex="^(pending|running|complete|aborted)$"),
+    phase: Optional[Phase] = None,
+    status: Optional[Literal["pending", "running", "complete", "aborted"]] = None,
     vessel_id: Optional[str] = None,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
-    List batches with optional filtering.
+    List batches with optional filtering, newest first.
 
     **Query Parameters:**
     - phase: Filter by campaign phase (A, B, or C)
@@ -105,44 +239,138 @@ async def list_batches(
     - vessel_id: Filter by vessel
     - limit: Number of results (max 100)
     - offset: Pagination offset
-    """
-    stmt = select(Batch).order_by(Batch.created_at.desc())
+    - cursor: Keyset pagination cursor (takes precedence over offset)
 
-    # Apply filters
+    Full pages carry an `X-Next-Cursor` response header; pass it back as
+    `cursor` for the next page. Cursor pages cost the same at any depth.
+    Offset pages also return the total number of matching batches in the
+    `X-Total-Count` header (cursor pages skip that count).
+
+    Null fields (e.g. inoculated_at before inoculation) are omitted from each
+    item; get_batch returns the full record.
+    """
+    headers = {}
+    filters = []
     if phase:
-        stmt = stmt.where(Batch.phase == phase)
+        filters.append(Batch.phase == phase)
     if status:
-        stmt = stmt.where(Batch.status == status)
+        filters.append(Batch.status == status)
     if vessel_id:
-        stmt = stmt.where(Batch.vessel_id == vessel_id)
+        filters.append(Batch.vessel_id == vessel_id)
+
+    # batch_id breaks created_at ties so page boundaries are deterministic
+    order = (Batch.created_at.desc(), Batch.batch_id.desc())
+
+    if cursor is not None:
+        # Keyset page: seek past the previous page's last row on the
+        # (created_at, batch_id) index instead of scanning and discarding
+        created_at, batch_id = _decode_cursor(cursor)
+        stmt = (
+            select(Batch, *_BATCH_COUNTS)
+            .options(raiseload("*"))
+            .where(*filters, tuple_(Batch.created_at, Batch.batch_id) < tuple_(created_at, batch_id))
+            .order_by(*order)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        rows = result.all()
+    else:
+        # COUNT(*) OVER () is evaluated before LIMIT/OFFSET, so the page and the
+        # total come back from one statement
+        stmt = (
+            select(Batch, *_BATCH_COUNTS, func.count().over().label("total"))
+            .options(raiseload("*"))
+            .where(*filters)
+            .order_by(*order)
+            .limit(limit)
+            .offset(offset)
+        )
 
-    # Pagination
-    stmt = stmt.limit(limit).offset(offset)
+        result = await db.execute(stmt)
+        rows = result.all()
 
-    result = await db.execute(stmt)
-    batches = result.scalars().all()
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: no row carries the window count, so ask directly
+            total = await db.scalar(select(func.count()).select_from(Batch).where(*filters))
+        else:
+            total = 0
 
-    return batches
+        headers["X-Total-Count"] = str(total)
 
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = _encode_cursor(rows[-1].Batch)
 
-@router.get("/batches/{batch_id}", response_model=BatchResponse)
+    now = datetime.now(timezone.utc)
+    content = _BATCH_LIST_ADAPTER.dump_json([_batch_response(row, now) for row in rows], exclude_none=True)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _encode_cursor(batch: Batch) -> str:
+    """Opaque keyset cursor pointing just past `batch` in list order."""
+    raw = f"{batch.created_at.isoformat()}|{batch.batch_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Inverse of _encode_cursor; raises 422 for anything it didn't produce."""
+    try:
+        created_at, batch_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        created_at = datetime.fromisoformat(created_at)
+        # Issued cursors always carry created_at's offset; a naive timestamp
+        # would be compared against the timestamptz key in the server's zone
+        if created_at.tzinfo is None:
+            raise ValueError("cursor timestamp has no UTC offset")
+        return created_at, UUID(batch_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid pagination cursor"
+        )
+
+
+@router.get("/batches/{batch_id}", response_model=BatchDetailResponse, response_model_exclude_unset=True)
 async def get_batch(
     batch_id: UUID,
+    request: Request,
+    include: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Get a single batch by ID with computed child record counts."""
-    # Load batch with relationships for counting
-    stmt = (
-        select(Batch)
-        .options(
-            selectinload(Batch.calibrations),
-            selectinload(Batch.samples),
-            selectinload(Batch.failures)
+    """
+    Get a single batch by ID with computed child record counts.
+
+    **Query Parameters:**
+    - include: Comma-separated child records to embed (samples, calibrations,
+      failures), saving a follow-up request per collection
+
+    Responses carry an ETag; send it back as If-None-Match to get a 304
+    when nothing has changed.
+    """
+    includes = _parse_include(include)
+
+    result = await db.execute(_BATCH_VERSION_BY_ID, {"batch_id": batch_id})
+    version = result.one_or_none()
+
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch {batch_id} not found"
         )
-        .where(Batch.batch_id == batch_id)
-    )
-    result = await db.execute(stmt)
+
+    # current_timepoint_hours is relative to now and shown to 0.01 h (36 s),
+    # so once inoculated the ETag also rolls over every 36 s
+    tick = int(time.time() // 36) if version.inoculated_at else None
+    etag = make_etag(*version, tick, sorted(includes))
+    if is_fresh(request, etag):
+        return not_modified(etag)
+
+    if includes:
+        stmt = _BATCH_BY_ID.options(*(_INCLUDABLE[name][0] for name in includes), raiseload("*"))
+    else:
+        stmt = _BATCH_ONLY_BY_ID
+    result = await db.execute(stmt, {"batch_id": batch_id})
     batch = result.scalar_one_or_none()
 
     if not batch:
@@ -151,28 +379,43 @@ async def get_batch(
             detail=f"Batch {batch_id} not found"
         )
 
-    # Manually populate computed fields since Pydantic can't access relationships
-    # Convert to dict and add computed counts
-    batch_dict = {
-        "batch_id": batch.batch_id,
-        "batch_number": batch.batch_number,
-        "phase": batch.phase,
-        "vessel_id": batch.vessel_id,
-        "operator_id": batch.operator_id,
-        "status": batch.status,
-        "created_at": batch.created_at,
-        "created_by": batch.created_by,
-        "inoculated_at": batch.inoculated_at,
-        "completed_at": batch.completed_at,
-        "notes": batch.notes,
-        # Computed counts (actual values, not placeholders!)
-        "total_samples_count": len(batch.samples) if batch.samples else 0,
-        "calibrations_count": len(batch.calibrations) if batch.calibrations else 0,
-        "critical_failures_count": sum(1 for f in (batch.failures or []) if f.deviation_level == 3),
-    }
-
-    # BatchResponse Pydantic model will compute runtime_hours and current_timepoint_hours
-    return batch_dict
+    batch_response = BatchResponse.from_orm_fast(
+        batch,
+        current_timepoint_hours=_timepoint_hours(batch.inoculated_at, datetime.now(timezone.utc)),
+        total_samples_count=version.total_samples_count,
+        calibrations_count=version.calibrations_count,
+        critical_failures_count=version.critical_failures_count,
+    )
+
+    # Relationships that weren't loaded must not be touched (raiseload), so the
+    # detail model is the batch's columns plus only the requested collections
+    children = {}
+    for name in includes:
+        sort_key = _INCLUDABLE[name][1]
+        rows = getattr(batch, name)
+        if sort_key:
+            rows = sorted(rows, key=sort_key)
+        children[name] = [_INCLUDABLE[name][2].from_orm_fast(child) for child in rows]
+
+    detail = BatchDetailResponse.model_construct(**dict(batch_response), **children)
+    response = model_response(detail, exclude_unset=True)
+    set_etag(response, etag)
+    return response
+
+
+def _parse_include(include: Optional[str]) -> FrozenSet[str]:
+    """Parse get_batch's `include` list; 422 on names it can't embed."""
+    if not include:
+        return frozenset()
+
+    names = frozenset(name.strip() for name in include.split(",") if name.strip())
+    unknown = names - _INCLUDABLE.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Cannot include {sorted(unknown)}; choose from {sorted(_INCLUDABLE)}"
+        )
+    return names
 
 
 @router.patch("/batches/{batch_id}", response_model=BatchResponse)
@@ -180,7 +423,7 @@ async def update_batch(
     batch_id: UUID,
     batch_update: BatchUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """
     Update batch metadata (limited fields).
@@ -188,33 +431,45 @@ async def update_batch(
     **Note:** Can only update notes and operator_id.
     Status changes are handled automatically by triggers.
     """
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
+    # Only allow updating certain fields
+    patch = {}
+    if batch_update.notes is not None:
+        patch["notes"] = batch_update.notes
+    if batch_update.operator_id is not None:
+        patch["operator_id"] = batch_update.operator_id
+
+    if patch:
+        # UPDATE ... RETURNING: one round-trip, and the returned row is already fresh
+        stmt = (
+            update(Batch)
+            .where(Batch.batch_id == batch_id)
+            .values(**patch)
+            .returning(Batch, Batch.runtime_hours, *_BATCH_COUNTS)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+    else:
+        result = await db.execute(_BATCH_WITH_COUNTS_BY_ID, {"batch_id": batch_id})
+    row = result.one_or_none()
 
-    if not batch:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Batch {batch_id} not found"
         )
 
-    # Only allow updating certain fields
-    if batch_update.notes is not None:
-        batch.notes = batch_update.notes
-    if batch_update.operator_id is not None:
-        batch.operator_id = batch_update.operator_id
+    if patch:
+        await db.commit()
+        _evict_reports(batch_id)
 
-    await db.commit()
-    await db.refresh(batch)
-
-    return batch
+    return _batch_response(row, datetime.now(timezone.utc))
 
 
 @router.delete("/batches/{batch_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_batch(
     batch_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """
     Delete a batch record.
@@ -222,35 +477,37 @@ async def delete_batch(
     **Warning:** This will cascade delete all child records (media prep, samples, etc.).
     Only use for test/invalid batches.
     """
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
-
-    if not batch:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Batch {batch_id} not found"
-        )
+    # One statement: completed batches are protected by the WHERE clause
+    # (production safety) and child records go via ON DELETE CASCADE
+    deleted_id = await db.scalar(_DELETE_UNLESS_COMPLETE, {"batch_id": batch_id})
+
+    if deleted_id is None:
+        # Nothing deleted - only now look up why
+        current_status = await batch_status(db, batch_id)
+
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Batch {batch_id} not found"
+            )
 
-    # Prevent deletion of completed batches (production safety)
-    if batch.status == "complete":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot delete completed batches"
         )
 
-    await db.delete(batch)
     await db.commit()
 
     return None
 
 
-@router.get("/batches/{batch_id}/export")
+# Every branch returns a prebuilt Response, so there's no response model to infer
+@router.get("/batches/{batch_id}/export", response_class=Response)
 async def export_batch(
     batch_id: UUID,
-    format: str = Query("markdown", regex="^(csv|markdown|json)$"),
+    format: Literal["csv", "markdown", "json"] = "markdown",
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Export complete batch data in multiple formats.
@@ -265,75 +522,104 @@ async def export_batch(
     - Markdown: Copy/paste into OneNote, GitHub, or lab reports
     - JSON: API integrations, data pipelines
     """
-    # Fetch batch with all relationships eagerly loaded
-    stmt = (
-        select(Batch)
-        .options(
-            selectinload(Batch.calibrations),
-            selectinload(Batch.inoculation),
-            selectinload(Batch.samples),
-            selectinload(Batch.failures),
-            selectinload(Batch.closure),
-            selectinload(Batch.media_prep)
-        )
-        .where(Batch.batch_id == batch_id)
-    )
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
+    if format == "csv":
+        result = await db.execute(_CSV_EXPORT_BY_ID, {"batch_id": batch_id})
+        batch = result.scalar_one_or_none()
 
-    if not batch:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Batch {batch_id} not found"
-        )
+        if not batch:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Batch {batch_id} not found"
+            )
 
-    # Generate export based on format
-    if format == "csv":
         return _export_csv(batch)
-    elif format == "markdown":
-        return _export_markdown(batch)
+
+    key = (batch_id, format)
+    report = _completed_reports.get(key)
+
+    if report is None:
+        report = await _report_flights.do(key, lambda: _build_report(batch_id, format))
+
+        if report is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Batch {batch_id} not found"
+            )
+
+        if report.complete:
+            _completed_reports[key] = report
+
+    if format == "markdown":
+        return PlainTextResponse(
+            content=report.content,
+            media_type="text/markdown",
+            headers={
+                "Content-Disposition": f"attachment; filename=batch_{report.batch_number}_phase_{report.phase}_report.md"
+            }
+        )
     else:  # json
-        return _export_json(batch)
+        return Response(
+            content=report.content,
+            media_type="application/json",
+            headers={
+                "Content-Disposition": f"attachment; filename=batch_{report.batch_number}_phase_{report.phase}_report.json"
+            }
+        )
 
 
-def _export_csv(batch: Batch) -> Response:
-    """Export sample data as CSV for model training."""
-    output = StringIO()
-    writer = csv.writer(output)
+async def _build_report(batch_id: UUID, format: str) -> Optional[_Report]:
+    """
+    Load a batch with its child records and render it as Markdown or JSON.
 
-    # Header
-    writer.writerow([
-        "batch_id",
-        "batch_number",
-        "phase",
-        "timepoint_hours",
-        "od600_raw",
-        "od600_dilution_factor",
-        "od600_calculated",
-        "dcw_g_per_l",
-        "contamination_detected",
-        "sampled_at"
-    ])
-
-    # Data rows
-    for sample in batch.samples:
-        writer.writerow([
-            str(batch.batch_id),
-            batch.batch_number,
-            batch.phase,
-            float(sample.timepoint_hours) if sample.timepoint_hours else None,
-            float(sample.od600_raw),
-            float(sample.od600_dilution_factor),
-            float(sample.od600_calculated) if sample.od600_calculated else None,
-            float(sample.dcw_g_per_l) if sample.dcw_g_per_l else None,
-            sample.contamination_detected,
-            sample.sampled_at.isoformat() if sample.sampled_at else None
-        ])
-
-    csv_content = output.getvalue()
-
-    return Response(
-        content=csv_content,
+    Returns None if the batch doesn't exist. Runs on its own session: the
+    shared task can outlive the request that started it, whose session is
+    closed once that request finishes or disconnects.
+    """
+    async with AsyncSessionLocal() as db:
+        # raiseload turns any relationship the renderers weren't given into an
+        # error instead of a hidden extra query
+        result = await db.execute(_REPORT_EXPORT_BY_ID, {"batch_id": batch_id})
+        batch = result.scalar_one_or_none()
+
+    if not batch:
+        return None
+
+    # Rendering is pure Python over already-loaded rows (no session access),
+    # so it runs on a worker thread instead of stalling the event loop
+    render = _render_markdown if format == "markdown" else _render_json
+    content = await asyncio.to_thread(render, batch)
+
+    return _Report(content, batch.batch_number, batch.phase, batch.status == "complete")
+
+
+CSV_HEADER = [
+    "batch_id",
+    "batch_number",
+    "phase",
+    "timepoint_hours",
+    "od600_raw",
+    "od600_dilution_factor",
+    "od600_calculated",
+    "dcw_g_per_l",
+    "contamination_detected",
+    "sampled_at"
+]
+
+# Samples fetched per server-side cursor round-trip (and per streamed chunk)
+CSV_STREAM_BATCH_SIZE = 500
+
+
+def _export_csv(batch: Batch) -> StreamingResponse:
+    """
+    Export sample data as CSV for model training.
+
+    Rows are streamed from a server-side cursor, so memory stays flat and the
+    first bytes go out before the last sample is read. The cursor runs on its
+    own session, since the request's session isn't guaranteed to outlive the
+    endpoint.
+    """
+    return StreamingResponse(
+        _stream_csv_rows(batch),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=batch_{batch.batch_number}_phase_{batch.phase}_samples.csv"
@@ -341,7 +627,74 @@ def _export_csv(batch: Batch) -> Response:
     )
 
 
-def _export_markdown(batch: Batch) -> PlainTextResponse:
+async def _stream_csv_rows(batch: Batch) -> AsyncIterator[str]:
+    """Yield the CSV header, then one chunk per CSV_STREAM_BATCH_SIZE samples."""
+    output = StringIO()
+    writer = csv.writer(output)
+
+    writer.writerow(CSV_HEADER)
+    yield output.getvalue()
+
+    stmt = (
+        select(Sample)
+        .where(Sample.batch_id == batch.batch_id)
+        .order_by(Sample.timepoint_hours)
+        .execution_options(yield_per=CSV_STREAM_BATCH_SIZE)
+    )
+
+    batch_id = str(batch.batch_id)
+    async with AsyncSessionLocal() as db:
+        samples = await db.stream_scalars(stmt)
+
+        async for partition in samples.partitions():
+            output.seek(0)
+            output.truncate()
+
+            for sample in partition:
+                writer.writerow([
+                    batch_id,
+                    batch.batch_number,
+                    batch.phase,
+                    sample.timepoint_hours,
+                    sample.od600_raw,
+                    sample.od600_dilution_factor,
+                    sample.od600_calculated,
+                    sample.dcw_g_per_l,
+                    sample.contamination_detected,
+                    sample.sampled_at.isoformat() if sample.sampled_at else None
+                ])
+
+            yield output.getvalue()
+
+
+_LEVEL_EMOJI = {1: "🟡", 2: "🟠", 3: "🔴"}
+
+
+def _cell(value, spec: str = "", suffix: str = "") -> str:
+    """Format an optional value for a Markdown table cell ("-" when missing)."""
+    return "-" if value is None else f"{value:{spec}}{suffix}"
+
+
+def _render_failure(failure: Failure) -> str:
+    """Markdown section for one failure/deviation record."""
+    lines = [
+        f"### {_LEVEL_EMOJI.get(failure.deviation_level, '⚪')} Level {failure.deviation_level} - {failure.category}",
+        "",
+        f"**Description:** {failure.description}",
+    ]
+
+    if failure.root_cause:
+        lines.append(f"**Root Cause:** {failure.root_cause}")
+
+    if failure.corrective_action:
+        lines.append(f"**Corrective Action:** {failure.corrective_action}")
+
+    lines.append(f"**Reported by:** {failure.reported_by}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _render_markdown(batch: Batch) -> str:
     """Export complete batch record as Markdown for OneNote/lab notebooks."""
 
     md = []
@@ -376,18 +729,12 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
         md.append("| Probe | Buffer Low | Buffer High | Reading Low | Reading High | Slope % | Pass |")
         md.append("|-------|-----------|-------------|-------------|--------------|---------|------|")
 
-        for cal in batch.calibrations:
-            slope = f"{float(cal.slope_percent):.1f}%" if cal.slope_percent else "-"
-            pass_status = "✅ PASS" if cal.pass_ else "❌ FAIL"
-
-            md.append(
-                f"| {cal.probe_type} | "
-                f"{float(cal.buffer_low_value) if cal.buffer_low_value else '-'} | "
-                f"{float(cal.buffer_high_value) if cal.buffer_high_value else '-'} | "
-                f"{float(cal.reading_low) if cal.reading_low else '-'} | "
-                f"{float(cal.reading_high) if cal.reading_high else '-'} | "
-                f"{slope} | {pass_status} |"
-            )
+        md.append("\n".join([
+            f"| {cal.probe_type} | {_cell(cal.buffer_low_value)} | {_cell(cal.buffer_high_value)} | "
+            f"{_cell(cal.reading_low)} | {_cell(cal.reading_high)} | "
+            f"{_cell(cal.slope_percent, '.1f', '%')} | {'✅ PASS' if cal.pass_ else '❌ FAIL'} |"
+            for cal in batch.calibrations
+        ]))
     else:
         md.append("*No calibration records*")
 
@@ -399,9 +746,9 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
 
     if batch.inoculation:
         inoc = batch.inoculation
-        md.append(f"- **Cryo Vial:** {inoc.cryo_vial_id}")
-        md.append(f"- **Inoculum OD₆₀₀:** {float(inoc.inoculum_od600):.2f}")
-        md.append(f"- **Volume:** {float(inoc.inoculum_volume_ml):.1f} mL")
+        md.append(f"- **Inoculum Source:** {inoc.inoculum_source}")
+        md.append(f"- **Inoculum OD₆₀₀:** {inoc.inoculum_od600:.2f}")
+        md.append(f"- **Volume:** {inoc.inoculum_volume_ml:.1f} mL")
         md.append(f"- **GO Decision:** {'✅ GO' if inoc.go_decision else '❌ NO-GO'}")
 
         if inoc.microscopy_observations:
@@ -421,17 +768,12 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
         md.append("| Time (h) | OD₆₀₀ (raw) | Dilution | OD₆₀₀ (calc) | DCW (g/L) | Contamination | Sampled By |")
         md.append("|----------|-------------|----------|--------------|-----------|---------------|------------|")
 
-        for sample in batch.samples:
-            time_h = f"{float(sample.timepoint_hours):.1f}" if sample.timepoint_hours else "-"
-            od_raw = f"{float(sample.od600_raw):.3f}"
-            dilution = f"{float(sample.od600_dilution_factor):.1f}×"
-            od_calc = f"{float(sample.od600_calculated):.2f}" if sample.od600_calculated else "-"
-            dcw = f"{float(sample.dcw_g_per_l):.2f}" if sample.dcw_g_per_l else "-"
-            contam = "⚠️ YES" if sample.contamination_detected else "✅ No"
-
-            md.append(
-                f"| {time_h} | {od_raw} | {dilution} | {od_calc} | {dcw} | {contam} | {sample.sampled_by} |"
-            )
+        md.append("\n".join([
+            f"| {_cell(s.timepoint_hours, '.1f')} | {s.od600_raw:.3f} | {s.od600_dilution_factor:.1f}× | "
+            f"{_cell(s.od600_calculated, '.2f')} | {_cell(s.dcw_g_per_l, '.2f')} | "
+            f"{'⚠️ YES' if s.contamination_detected else '✅ No'} | {s.sampled_by} |"
+            for s in batch.samples
+        ]))
 
         md.append("")
         md.append(f"**Total samples:** {len(batch.samples)}")
@@ -445,20 +787,7 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
         md.append("## Failures & Deviations")
         md.append("")
 
-        for failure in batch.failures:
-            level_emoji = {1: "🟡", 2: "🟠", 3: "🔴"}
-            md.append(f"### {level_emoji.get(failure.deviation_level, '⚪')} Level {failure.deviation_level} - {failure.category}")
-            md.append("")
-            md.append(f"**Description:** {failure.description}")
-
-            if failure.root_cause:
-                md.append(f"**Root Cause:** {failure.root_cause}")
-
-            if failure.corrective_action:
-                md.append(f"**Corrective Action:** {failure.corrective_action}")
-
-            md.append(f"**Reported by:** {failure.reported_by}")
-            md.append("")
+        md.append("\n".join([_render_failure(failure) for failure in batch.failures]))
 
     # Closure
     if batch.closure:
@@ -466,9 +795,9 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
         md.append("")
         closure = batch.closure
 
-        md.append(f"- **Final OD₆₀₀:** {float(closure.final_od600):.2f}" if closure.final_od600 else "")
-        md.append(f"- **Total Runtime:** {float(closure.total_runtime_hours):.1f} hours" if closure.total_runtime_hours else "")
-        md.append(f"- **Glycerol Depletion:** {float(closure.glycerol_depletion_time_hours):.1f} h" if closure.glycerol_depletion_time_hours else "")
+        md.append("" if closure.final_od600 is None else f"- **Final OD₆₀₀:** {closure.final_od600:.2f}")
+        md.append("" if closure.total_runtime_hours is None else f"- **Total Runtime:** {closure.total_runtime_hours:.1f} hours")
+        md.append("" if closure.glycerol_depletion_time_hours is None else f"- **Glycerol Depletion:** {closure.glycerol_depletion_time_hours:.1f} h")
         md.append(f"- **DO Spike Observed:** {'Yes' if closure.do_spike_observed else 'No'}")
         md.append(f"- **Outcome:** {closure.outcome}")
         md.append(f"- **Closed by:** {closure.closed_by}")
@@ -479,23 +808,21 @@ def _export_markdown(batch: Batch) -> PlainTextResponse:
 
     md.append("")
     md.append("---")
-    md.append(f"\n*Exported: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}*")
+    md.append(f"\n*Exported: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}*")
 
-    markdown_content = "\n".join(md)
+    return "\n".join(md)
 
-    return PlainTextResponse(
-        content=markdown_content,
-        media_type="text/markdown",
-        headers={
-            "Content-Disposition": f"attachment; filename=batch_{batch.batch_number}_phase_{batch.phase}_report.md"
-        }
-    )
 
+def _render_json(batch: Batch) -> bytes:
+    """
+    Export complete batch record as JSON.
 
-def _export_json(batch: Batch) -> dict:
-    """Export complete batch record as JSON."""
+    Encoded here with orjson (datetime handled natively), so FastAPI's
+    jsonable_encoder pass is skipped entirely. batch_id is str()'d: asyncpg
+    returns its own UUID subclass, which orjson rejects.
+    """
 
-    return {
+    return orjson.dumps({
         "batch": {
             "batch_id": str(batch.batch_id),
             "batch_number": batch.batch_number,
@@ -503,44 +830,44 @@ def _export_json(batch: Batch) -> dict:
             "vessel_id": batch.vessel_id,
             "operator_id": batch.operator_id,
             "status": batch.status,
-            "created_at": batch.created_at.isoformat() if batch.created_at else None,
-            "inoculated_at": batch.inoculated_at.isoformat() if batch.inoculated_at else None,
-            "completed_at": batch.completed_at.isoformat() if batch.completed_at else None,
+            "created_at": batch.created_at,
+            "inoculated_at": batch.inoculated_at,
+            "completed_at": batch.completed_at,
             "notes": batch.notes
         },
         "calibrations": [
             {
                 "probe_type": cal.probe_type,
-                "buffer_low_value": float(cal.buffer_low_value) if cal.buffer_low_value else None,
-                "buffer_high_value": float(cal.buffer_high_value) if cal.buffer_high_value else None,
-                "reading_low": float(cal.reading_low) if cal.reading_low else None,
-                "reading_high": float(cal.reading_high) if cal.reading_high else None,
-                "slope_percent": float(cal.slope_percent) if cal.slope_percent else None,
+                "buffer_low_value": cal.buffer_low_value,
+                "buffer_high_value": cal.buffer_high_value,
+                "reading_low": cal.reading_low,
+                "reading_high": cal.reading_high,
+                "slope_percent": cal.slope_percent,
                 "pass": cal.pass_,
                 "calibrated_by": cal.calibrated_by,
-                "calibrated_at": cal.calibrated_at.isoformat() if cal.calibrated_at else None
+                "calibrated_at": cal.calibrated_at
             }
             for cal in batch.calibrations
         ] if batch.calibrations else [],
         "inoculation": {
-            "cryo_vial_id": batch.inoculation.cryo_vial_id,
-            "inoculum_od600": float(batch.inoculation.inoculum_od600),
-            "inoculum_volume_ml": float(batch.inoculation.inoculum_volume_ml),
+            "inoculum_source": batch.inoculation.inoculum_source,
+            "inoculum_od600": batch.inoculation.inoculum_od600,
+            "inoculum_volume_ml": batch.inoculation.inoculum_volume_ml,
             "go_decision": batch.inoculation.go_decision,
             "microscopy_observations": batch.inoculation.microscopy_observations,
             "inoculated_by": batch.inoculation.inoculated_by
         } if batch.inoculation else None,
         "samples": [
             {
-                "timepoint_hours": float(sample.timepoint_hours) if sample.timepoint_hours else None,
-                "od600_raw": float(sample.od600_raw),
-                "od600_dilution_factor": float(sample.od600_dilution_factor),
-                "od600_calculated": float(sample.od600_calculated) if sample.od600_calculated else None,
-                "dcw_g_per_l": float(sample.dcw_g_per_l) if sample.dcw_g_per_l else None,
+                "timepoint_hours": sample.timepoint_hours,
+                "od600_raw": sample.od600_raw,
+                "od600_dilution_factor": sample.od600_dilution_factor,
+                "od600_calculated": sample.od600_calculated,
+                "dcw_g_per_l": sample.dcw_g_per_l,
                 "contamination_detected": sample.contamination_detected,
                 "microscopy_observations": sample.microscopy_observations,
                 "sampled_by": sample.sampled_by,
-                "sampled_at": sample.sampled_at.isoformat() if sample.sampled_at else None
+                "sampled_at": sample.sampled_at
             }
             for sample in batch.samples
         ] if batch.samples else [],
@@ -552,17 +879,17 @@ def _export_json(batch: Batch) -> dict:
                 "root_cause": failure.root_cause,
                 "corrective_action": failure.corrective_action,
                 "reported_by": failure.reported_by,
-                "reported_at": failure.reported_at.isoformat() if failure.reported_at else None
+                "reported_at": failure.reported_at
             }
             for failure in batch.failures
         ] if batch.failures else [],
         "closure": {
-            "final_od600": float(batch.closure.final_od600) if batch.closure.final_od600 else None,
-            "total_runtime_hours": float(batch.closure.total_runtime_hours) if batch.closure.total_runtime_hours else None,
-            "glycerol_depletion_time_hours": float(batch.closure.glycerol_depletion_time_hours) if batch.closure.glycerol_depletion_time_hours else None,
+            "final_od600": batch.closure.final_od600,
+            "total_runtime_hours": batch.closure.total_runtime_hours,
+            "glycerol_depletion_time_hours": batch.closure.glycerol_depletion_time_hours,
             "outcome": batch.closure.outcome,
             "closed_by": batch.closure.closed_by,
             "approved_by": batch.closure.approved_by,
             "notes": batch.closure.notes
         } if batch.closure else None
-    }
+    })
@@ -1,44 +1,42 @@
 """Calibration endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from typing import List
 from uuid import UUID
 
 from ..database import get_db
-from ..models import Calibration, Batch, User
-from ..schemas import CalibrationCreate, CalibrationResponse
-from ..auth import require_technician
+from ..models import Calibration
+from ..schemas import CalibrationCreate, CalibrationListItem, CalibrationResponse, apply_schema
+from ..auth import require_technician, CurrentUser
+from .common import require_batch_status, stream_json_list
+from ..http_cache import append_only_version, is_fresh, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
+# Built once; fetches plain rows of the response columns, not ORM instances
+_LIST_CALIBRATIONS = (
+    select(*(getattr(Calibration, name) for name in CalibrationResponse.model_fields))
+    .where(Calibration.batch_id == bindparam("batch_id"))
+    .order_by(Calibration.calibrated_at)
+)
+
+_CALIBRATIONS_VERSION = append_only_version(Calibration)
+
 
 @router.post("/batches/{batch_id}/calibrations", response_model=CalibrationResponse, status_code=status.HTTP_201_CREATED)
 async def create_calibration(
     batch_id: UUID,
     calibration_in: CalibrationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """Log sensor calibration for a batch."""
     # Verify batch exists and is in pending status
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
-
-    if not batch:
-        raise HTTPException(status_code=404, detail="Batch not found")
-
-    if batch.status != "pending":
-        raise HTTPException(status_code=422, detail="Cannot add calibration: batch already started")
+    await require_batch_status(db, batch_id, "pending", "Cannot add calibration: batch already started")
 
-    # Convert the schema to dict (use by_alias=False to get Python field names like pass_)
-    calibration_data = calibration_in.model_dump(exclude_unset=True, by_alias=False)
-    calibration = Calibration(
-        batch_id=batch_id,
-        **calibration_data
-    )
+    calibration = apply_schema(Calibration(batch_id=batch_id), calibration_in)
 
     db.add(calibration)
     await db.commit()
@@ -47,13 +45,19 @@ async def create_calibration(
     return calibration
 
 
-@router.get("/batches/{batch_id}/calibrations", response_model=List[CalibrationResponse])
+@router.get("/batches/{batch_id}/calibrations", response_model=List[CalibrationListItem])
 async def list_calibrations(
     batch_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
-    """List all calibrations for a batch."""
-    stmt = select(Calibration).where(Calibration.batch_id == batch_id).order_by(Calibration.calibrated_at)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    """List all calibrations for a batch (null fields are omitted from each item)."""
+    result = await db.execute(_CALIBRATIONS_VERSION, {"batch_id": batch_id})
+    etag = make_etag(*result.one())
+    if is_fresh(request, etag):
+        return not_modified(etag)
+
+    response = await stream_json_list(_LIST_CALIBRATIONS, {"batch_id": batch_id}, CalibrationResponse)
+    set_etag(response, etag)
+    return response
@@ -2,23 +2,41 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
 from uuid import UUID
 
 from ..database import get_db
-from ..models import BatchClosure, Batch, Sample, Failure, User
-from ..schemas import BatchClosureCreate, BatchClosureResponse
-from ..auth import require_engineer
+from ..models import BatchClosure, Batch, Sample, Failure
+from ..schemas import BatchClosureCreate, BatchClosureResponse, DeviationLevel, apply_schema
+from ..auth import require_engineer, CurrentUser
 
 router = APIRouter()
 
+# Closure preconditions in one round-trip, as counts rather than hydrated rows.
+# Returns no row when the batch doesn't exist.
+_CLOSURE_PRECHECK = select(
+    Batch.status,
+    select(func.count())
+    .where(Sample.batch_id == bindparam("batch_id"))
+    .scalar_subquery()
+    .label("sample_count"),
+    select(func.count())
+    .where(
+        Failure.batch_id == bindparam("batch_id"),
+        Failure.deviation_level == DeviationLevel.CRITICAL,
+        Failure.reviewed_by.is_(None)
+    )
+    .scalar_subquery()
+    .label("unreviewed_critical_count"),
+).where(Batch.batch_id == bindparam("batch_id"))
+
 
 @router.post("/batches/{batch_id}/close", response_model=BatchClosureResponse, status_code=status.HTTP_201_CREATED)
 async def close_batch(
     batch_id: UUID,
     closure_in: BatchClosureCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_engineer)  # Only engineers can close batches
+    current_user: CurrentUser = Depends(require_engineer)  # Only engineers can close batches
 ):
     """
     Close batch and finalize record.
@@ -29,48 +47,32 @@ async def close_batch(
     - All Level 3 failures must be reviewed
     - Requires engineer role
     """
-    # Verify batch exists and is running
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
+    result = await db.execute(_CLOSURE_PRECHECK, {"batch_id": batch_id})
+    precheck = result.one_or_none()
 
-    if not batch:
+    # Verify batch exists and is running
+    if precheck is None:
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    if batch.status != "running":
+    if precheck.status != "running":
         raise HTTPException(status_code=422, detail="Cannot close batch: not yet started")
 
     # Check minimum sample count
-    stmt = select(Sample).where(Sample.batch_id == batch_id)
-    result = await db.execute(stmt)
-    samples = result.scalars().all()
-
-    if len(samples) < 8:
+    if precheck.sample_count < 8:
         raise HTTPException(
             status_code=422,
-            detail=f"Cannot close: only {len(samples)} samples (minimum 8 required)"
+            detail=f"Cannot close: only {precheck.sample_count} samples (minimum 8 required)"
         )
 
     # Check for unreviewed critical failures
-    stmt = select(Failure).where(
-        Failure.batch_id == batch_id,
-        Failure.deviation_level == 3,
-        Failure.reviewed_by == None
-    )
-    result = await db.execute(stmt)
-    unreviewed_failures = result.scalars().all()
-
-    if unreviewed_failures:
+    if precheck.unreviewed_critical_count:
         raise HTTPException(
             status_code=422,
-            detail=f"Cannot close: {len(unreviewed_failures)} unreviewed critical failures"
+            detail=f"Cannot close: {precheck.unreviewed_critical_count} unreviewed critical failures"
         )
 
     # Create closure (trigger will update batch status)
-    closure = BatchClosure(
-        batch_id=batch_id,
-        **closure_in.model_dump(exclude_unset=True)
-    )
+    closure = apply_schema(BatchClosure(batch_id=batch_id), closure_in)
 
     db.add(closure)
     await db.commit()
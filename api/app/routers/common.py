@@ -0,0 +1,105 @@
+"""Batch lookups and list streaming shared by the batch and child-record routers."""
+
+from functools import lru_cache
+from typing import Any, AsyncIterator, List, Mapping, Optional, Type
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Select, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..models import Batch
+from ..schemas import CalibrationResponse, FailureResponse, SampleResponse
+
+# Status is all the existence/state checks need, so only that column is fetched
+_BATCH_STATUS_BY_ID = select(Batch.status).where(Batch.batch_id == bindparam("batch_id"))
+
+# Share-locked until commit so the batch can't change status (or disappear)
+# between the check and the child insert that depends on it
+_BATCH_STATUS_FOR_SHARE = _BATCH_STATUS_BY_ID.with_for_update(read=True)
+
+
+async def batch_status(db: AsyncSession, batch_id: UUID) -> Optional[str]:
+    """Return the batch's status, or None if it doesn't exist."""
+    return await db.scalar(_BATCH_STATUS_BY_ID, {"batch_id": batch_id})
+
+
+async def require_batch_status(db: AsyncSession, batch_id: UUID, expected: str, detail: str) -> None:
+    """
+    Share-lock a batch and check it is in the `expected` status.
+
+    Raises:
+        HTTPException: 404 if the batch doesn't exist, 422 with `detail` if it
+            is in any other status
+    """
+    status = await db.scalar(_BATCH_STATUS_FOR_SHARE, {"batch_id": batch_id})
+
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    if status != expected:
+        raise HTTPException(status_code=422, detail=detail)
+
+
+# Rows per server-side cursor round-trip (and per streamed chunk) for list endpoints
+LIST_STREAM_BATCH_SIZE = 200
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+# Build the streamed endpoints' list schemas at import, so the first list
+# request under each worker doesn't pay for the core schema build
+for _model in (SampleResponse, CalibrationResponse, FailureResponse):
+    _list_adapter(_model)
+
+
+async def stream_json_list(
+    stmt: Select,
+    params: Mapping[str, Any],
+    model: Type[BaseModel],
+) -> StreamingResponse:
+    """
+    Run `stmt` on a server-side cursor and stream its rows as a JSON array.
+
+    `model` is the response schema (a FastFromORM) for the selected columns;
+    rows are copied into it unvalidated, and null fields are left out of each
+    item to keep long lists small. Only one chunk of rows is in memory
+    at a time, and the first bytes go out before the last row is read. The
+    query runs before the response starts, so database errors still surface
+    as normal error responses.
+
+    The cursor gets its own session, closed when the stream ends: the
+    request's session isn't guaranteed to outlive the endpoint.
+    """
+    session = AsyncSessionLocal()
+    try:
+        result = await session.stream(stmt.execution_options(yield_per=LIST_STREAM_BATCH_SIZE), params)
+    except BaseException:
+        await session.close()
+        raise
+    return StreamingResponse(_json_array_chunks(session, result, model), media_type="application/json")
+
+
+async def _json_array_chunks(
+    session: AsyncSession, result: AsyncResult, model: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    adapter = _list_adapter(model)
+    try:
+        yield b"["
+        separator = b""
+        async for partition in result.partitions():
+            chunk = adapter.dump_json(
+                [model.from_orm_fast(row) for row in partition], by_alias=True, exclude_none=True
+            )
+            # Strip the chunk's own [ ] so it splices into the outer array
+            yield separator + chunk[1:-1]
+            separator = b","
+        yield b"]"
+    finally:
+        await session.close()
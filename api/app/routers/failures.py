@@ -1,54 +1,68 @@
 """Failure/deviation endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import IntegrityError
 from typing import List
 from uuid import UUID
 
-from ..database import get_db
-from ..models import Failure, Batch, User
-from ..schemas import FailureCreate, FailureResponse
-from ..auth import require_technician
+from ..database import get_db, is_foreign_key_violation
+from ..models import Failure
+from ..schemas import FailureCreate, FailureListItem, FailureResponse, apply_schema
+from ..auth import require_technician, CurrentUser
+from .common import stream_json_list
+from ..http_cache import append_only_version, is_fresh, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
+# Built once; list_failures serializes these rows without hydrating Failure objects
+_LIST_FAILURES = (
+    select(*(getattr(Failure, name) for name in FailureResponse.model_fields))
+    .where(Failure.batch_id == bindparam("batch_id"))
+    .order_by(Failure.reported_at)
+)
+
+_FAILURES_VERSION = append_only_version(Failure)
+
 
 @router.post("/batches/{batch_id}/failures", response_model=FailureResponse, status_code=status.HTTP_201_CREATED)
 async def create_failure(
     batch_id: UUID,
     failure_in: FailureCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """Log deviation or failure event."""
-    # Verify batch exists
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
-
-    if not batch:
-        raise HTTPException(status_code=404, detail="Batch not found")
-
-    failure = Failure(
-        batch_id=batch_id,
-        **failure_in.model_dump(exclude_unset=True)
-    )
+    failure = apply_schema(Failure(batch_id=batch_id), failure_in)
 
     db.add(failure)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        # The batch_id foreign key doubles as the "batch exists" check
+        if is_foreign_key_violation(exc):
+            raise HTTPException(status_code=404, detail="Batch not found")
+        raise
+
     await db.refresh(failure)
 
     return failure
 
 
-@router.get("/batches/{batch_id}/failures", response_model=List[FailureResponse])
+@router.get("/batches/{batch_id}/failures", response_model=List[FailureListItem])
 async def list_failures(
     batch_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
-    """List all failures for a batch."""
-    stmt = select(Failure).where(Failure.batch_id == batch_id).order_by(Failure.reported_at)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    """List all failures for a batch (null fields are omitted from each item)."""
+    result = await db.execute(_FAILURES_VERSION, {"batch_id": batch_id})
+    etag = make_etag(*result.one())
+    if is_fresh(request, etag):
+        return not_modified(etag)
+
+    response = await stream_json_list(_LIST_FAILURES, {"batch_id": batch_id}, FailureResponse)
+    set_etag(response, etag)
+    return response
@@ -2,23 +2,45 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import JSON, bindparam, exists, false, func, literal_column, select
 from uuid import UUID
 
 from ..database import get_db
-from ..models import Inoculation, Batch, Calibration, MediaPreparation, User
-from ..schemas import InoculationCreate, InoculationResponse
-from ..auth import require_technician
+from ..models import Inoculation, Batch, Calibration, MediaPreparation
+from ..schemas import InoculationCreate, InoculationResponse, apply_schema
+from ..auth import require_technician, CurrentUser
 
 router = APIRouter()
 
+# All inoculation preconditions in one round-trip: does the batch exist, does it
+# have a media prep, and which calibrations (if any) failed
+_INOCULATION_PRECHECK = select(
+    exists().where(Batch.batch_id == bindparam("batch_id")).label("batch_exists"),
+    exists().where(MediaPreparation.batch_id == bindparam("batch_id")).label("media_prepared"),
+    select(
+        func.json_agg(
+            func.json_build_object(
+                # Keys inlined as SQL literals: asyncpg can't infer a type
+                # for bound parameters in json_build_object's variadic args
+                literal_column("'probe_type'"), Calibration.probe_type,
+                literal_column("'slope_percent'"), Calibration.slope_percent
+            ),
+            type_=JSON
+        )
+    )
+    # "pass = false" (not IS FALSE) so it matches idx_calibrations_failed's predicate
+    .where(Calibration.batch_id == bindparam("batch_id"), Calibration.pass_ == false())
+    .scalar_subquery()
+    .label("failed_calibrations")
+)
+
 
 @router.post("/batches/{batch_id}/inoculation", response_model=InoculationResponse, status_code=status.HTTP_201_CREATED)
 async def create_inoculation(
     batch_id: UUID,
     inoculation_in: InoculationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """
     Log inoculation and set T=0.
@@ -28,32 +50,22 @@ async def create_inoculation(
     - Media prep must exist
     - GO decision must be TRUE
     """
-    # Verify batch exists
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
+    result = await db.execute(_INOCULATION_PRECHECK, {"batch_id": batch_id})
+    precheck = result.one()
 
-    if not batch:
+    # Verify batch exists
+    if not precheck.batch_exists:
         raise HTTPException(status_code=404, detail="Batch not found")
 
     # Check media prep exists
-    stmt = select(MediaPreparation).where(MediaPreparation.batch_id == batch_id)
-    result = await db.execute(stmt)
-    media_prep = result.scalar_one_or_none()
-
-    if not media_prep:
+    if not precheck.media_prepared:
         raise HTTPException(status_code=422, detail="Cannot inoculate: no media prep record")
 
-    # Check all calibrations pass
-    stmt = select(Calibration).where(Calibration.batch_id == batch_id)
-    result = await db.execute(stmt)
-    calibrations = result.scalars().all()
-
-    failed_cals = [c for c in calibrations if not c.pass_]
-    if failed_cals:
+    # Check all calibrations pass (json_agg yields NULL when none failed)
+    if precheck.failed_calibrations:
         detail = {
             "message": "Cannot inoculate: calibration failed",
-            "failed_calibrations": [{"probe_type": c.probe_type, "slope_percent": float(c.slope_percent) if c.slope_percent else None} for c in failed_cals]
+            "failed_calibrations": precheck.failed_calibrations
         }
         raise HTTPException(status_code=422, detail=detail)
 
@@ -62,10 +74,7 @@ async def create_inoculation(
         raise HTTPException(status_code=422, detail="Inoculation rejected by operator (GO=FALSE)")
 
     # Create inoculation (trigger will update batch status)
-    inoculation = Inoculation(
-        batch_id=batch_id,
-        **inoculation_in.model_dump(exclude_unset=True)
-    )
+    inoculation = apply_schema(Inoculation(batch_id=batch_id), inoculation_in)
 
     db.add(inoculation)
     await db.commit()
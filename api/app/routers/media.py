@@ -1,42 +1,61 @@
 """Media preparation endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, literal_column, select
+from sqlalchemy.exc import IntegrityError
 from uuid import UUID
 
-from ..database import get_db
-from ..models import MediaPreparation, Batch, User
-from ..schemas import MediaPreparationCreate, MediaPreparationResponse
-from ..auth import require_technician
+from ..database import get_db, is_foreign_key_violation
+from ..models import MediaPreparation
+from ..schemas import MediaPreparationCreate, MediaPreparationResponse, apply_schema
+from ..auth import require_technician, CurrentUser
+from .common import batch_status
+from ..responses import model_response
+from ..http_cache import is_fresh, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
+# Built once so only the bound batch_id changes between requests
+_MEDIA_BY_BATCH = select(MediaPreparation).where(MediaPreparation.batch_id == bindparam("batch_id"))
+
+# Validator for the batch's media record: xmin changes on every UPDATE of the row
+_MEDIA_VERSION_BY_BATCH = (
+    select(MediaPreparation.id, literal_column("media_preparations.xmin"))
+    .where(MediaPreparation.batch_id == bindparam("batch_id"))
+)
+
 
 @router.get("/batches/{batch_id}/media", response_model=MediaPreparationResponse)
 async def get_media_preparation(
     batch_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """Get media preparation record for a batch."""
-    # Verify batch exists
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
+    result = await db.execute(_MEDIA_VERSION_BY_BATCH, {"batch_id": batch_id})
+    version = result.one_or_none()
+
+    if version is None:
+        # Verify batch exists, to pick the right 404
+        if await batch_status(db, batch_id) is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        raise HTTPException(status_code=404, detail="Media preparation not found")
 
-    if not batch:
-        raise HTTPException(status_code=404, detail="Batch not found")
+    etag = make_etag(*version)
+    if is_fresh(request, etag):
+        return not_modified(etag)
 
     # Get media prep
-    stmt = select(MediaPreparation).where(MediaPreparation.batch_id == batch_id)
-    result = await db.execute(stmt)
-    media_prep = result.scalar_one_or_none()
+    media_prep = await db.scalar(_MEDIA_BY_BATCH, {"batch_id": batch_id})
 
     if not media_prep:
         raise HTTPException(status_code=404, detail="Media preparation not found")
 
-    return media_prep
+    response = model_response(MediaPreparationResponse.from_orm_fast(media_prep))
+    set_etag(response, etag)
+    return response
 
 
 @router.post("/batches/{batch_id}/media", response_model=MediaPreparationResponse, status_code=status.HTTP_201_CREATED)
@@ -44,7 +63,7 @@ async def create_media_preparation(
     batch_id: UUID,
     media_in: MediaPreparationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """
     Log media preparation for a batch.
@@ -56,33 +75,23 @@ async def create_media_preparation(
     - autoclave_cycle
     - prepared_by
     """
-    # Verify batch exists
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
-
-    if not batch:
-        raise HTTPException(status_code=404, detail="Batch not found")
-
-    # Check if media prep already exists
-    stmt = select(MediaPreparation).where(MediaPreparation.batch_id == batch_id)
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        raise HTTPException(
-            status_code=409,
-            detail="Media preparation already logged for this batch"
-        )
-
-    # Create media preparation
-    media_prep = MediaPreparation(
-        batch_id=batch_id,
-        **media_in.model_dump(exclude_unset=True)
-    )
+    # Create media preparation. The batch_id foreign key and the
+    # one_media_prep_per_batch constraint stand in for pre-insert lookups.
+    media_prep = apply_schema(MediaPreparation(batch_id=batch_id), media_in)
 
     db.add(media_prep)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        if is_foreign_key_violation(exc):
+            raise HTTPException(status_code=404, detail="Batch not found")
+        if "one_media_prep_per_batch" in str(exc.orig):
+            raise HTTPException(
+                status_code=409,
+                detail="Media preparation already logged for this batch"
+            )
+        raise
+
     await db.refresh(media_prep)
 
     return media_prep
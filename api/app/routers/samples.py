@@ -1,43 +1,68 @@
 """Sample endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import Field, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import bindparam, insert, select
+from typing import Annotated, List
 from uuid import UUID
 
 from ..database import get_db
-from ..models import Sample, Batch, User
-from ..schemas import SampleCreate, SampleResponse
-from ..auth import require_technician
+from ..models import Sample
+from ..schemas import SampleCreate, SampleListItem, SampleResponse, apply_schema
+from ..auth import require_technician, CurrentUser
+from .common import require_batch_status, stream_json_list
+from ..http_cache import append_only_version, is_fresh, make_etag, not_modified, set_etag
 
 router = APIRouter()
 
+# Built once so only the bound batch_id changes between requests. Selects just
+# the response columns as plain rows (no ORM instances or identity map), which
+# are copied into SampleResponse and serialized straight to JSON bytes.
+_LIST_SAMPLES = (
+    select(*(getattr(Sample, name) for name in SampleResponse.model_fields))
+    .where(Sample.batch_id == bindparam("batch_id"))
+    .order_by(Sample.timepoint_hours)
+)
+
+_SAMPLES_VERSION = append_only_version(Sample)
+
+# Bulk bodies are validated straight from the request bytes by pydantic-core's
+# JSON parser, skipping FastAPI's json.loads() -> dict -> validate round trip
+_SAMPLE_BATCH = TypeAdapter(Annotated[List[SampleCreate], Field(min_length=1, max_length=500)])
+# Documented by hand since the body no longer comes from a signature parameter;
+# SampleCreate itself is already in components via create_sample
+_SAMPLE_BATCH_SCHEMA = _SAMPLE_BATCH.json_schema(ref_template="#/components/schemas/{model}")
+del _SAMPLE_BATCH_SCHEMA["$defs"]
+_SAMPLE_BATCH_BODY = {
+    "requestBody": {"required": True, "content": {"application/json": {"schema": _SAMPLE_BATCH_SCHEMA}}}
+}
+
+
+async def _sample_batch_body(request: Request) -> List[SampleCreate]:
+    """Parse and validate a bulk sample body, reporting errors like FastAPI's own."""
+    try:
+        return _SAMPLE_BATCH.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+        )
+
 
 @router.post("/batches/{batch_id}/samples", response_model=SampleResponse, status_code=status.HTTP_201_CREATED)
 async def create_sample(
     batch_id: UUID,
     sample_in: SampleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
     """Log in-process sample observation."""
     # Verify batch is running
-    stmt = select(Batch).where(Batch.batch_id == batch_id)
-    result = await db.execute(stmt)
-    batch = result.scalar_one_or_none()
-
-    if not batch:
-        raise HTTPException(status_code=404, detail="Batch not found")
-
-    if batch.status != "running":
-        raise HTTPException(status_code=422, detail="Cannot add sample: batch not yet inoculated")
+    await require_batch_status(db, batch_id, "running", "Cannot add sample: batch not yet inoculated")
 
     # Create sample (triggers will calculate timepoint, OD, DCW)
-    sample = Sample(
-        batch_id=batch_id,
-        **sample_in.model_dump(exclude_unset=True, exclude={"od600_calculated"})
-    )
+    sample = apply_schema(Sample(batch_id=batch_id), sample_in)
 
     db.add(sample)
     await db.commit()
@@ -46,13 +71,55 @@ async def create_sample(
     return sample
 
 
-@router.get("/batches/{batch_id}/samples", response_model=List[SampleResponse])
+@router.post(
+    "/batches/{batch_id}/samples/bulk",
+    response_model=List[SampleResponse],
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_SAMPLE_BATCH_BODY,
+)
+async def create_samples_bulk(
+    batch_id: UUID,
+    # Declared before the body: dependencies resolve in order, so anonymous
+    # callers are rejected before their (up to 500-item) body is parsed
+    current_user: CurrentUser = Depends(require_technician),
+    samples_in: List[SampleCreate] = Depends(_sample_batch_body),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Log several in-process samples at once (e.g. importing a sampling sheet).
+
+    All rows go in with one INSERT ... RETURNING and one commit; either every
+    sample is recorded or none are. Returned in request order.
+    """
+    # Verify batch is running
+    await require_batch_status(db, batch_id, "running", "Cannot add sample: batch not yet inoculated")
+
+    # Same fields apply_schema would copy, read straight off each schema rather
+    # than via model_dump; triggers calculate timepoint, OD, DCW
+    rows = [
+        {"batch_id": batch_id, **{name: getattr(sample_in, name) for name in sample_in.model_fields_set}}
+        for sample_in in samples_in
+    ]
+    result = await db.scalars(insert(Sample).returning(Sample, sort_by_parameter_order=True), rows)
+    samples = result.all()
+    await db.commit()
+
+    return samples
+
+
+@router.get("/batches/{batch_id}/samples", response_model=List[SampleListItem])
 async def list_samples(
     batch_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_technician)
+    current_user: CurrentUser = Depends(require_technician)
 ):
-    """List all samples for a batch."""
-    stmt = select(Sample).where(Sample.batch_id == batch_id).order_by(Sample.timepoint_hours)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    """List all samples for a batch (null fields are omitted from each item)."""
+    result = await db.execute(_SAMPLES_VERSION, {"batch_id": batch_id})
+    etag = make_etag(*result.one())
+    if is_fresh(request, etag):
+        return not_modified(etag)
+
+    response = await stream_json_list(_LIST_SAMPLES, {"batch_id": batch_id}, SampleResponse)
+    set_etag(response, etag)
+    return response
@@ -3,11 +3,114 @@ Pydantic schemas for request/response validation.
 Provides type safety and automatic validation for API endpoints.
 """
 
-from pydantic import BaseModel, Field, field_validator, computed_field
-from typing import Optional, Literal
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Annotated, Final, List, Optional, Literal, Union
+from types import MappingProxyType
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
+from enum import IntEnum, StrEnum
+from functools import lru_cache
+import math
+
+
+# ============================================================================
+# SHARED
+# ============================================================================
+
+# Response schemas are read-only views of trusted database rows
+_RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    populate_by_name=True,
+    extra="ignore",
+    frozen=True,
+)
+
+
+# Constrained types shared by the create schemas; each is built once and
+# reused by every field that carries it
+_NonNegative = Annotated[float, Field(ge=0)]
+_Dilution = Annotated[float, Field(ge=1.0)]
+_NonNegativeDecimal = Annotated[Decimal, Field(ge=0)]
+_PercentDecimal = Annotated[Decimal, Field(ge=0, le=100)]
+_NonEmptyStr = Annotated[str, Field(min_length=1)]
+
+
+class FastFromORM:
+    """
+    Mixin for response schemas built from trusted database rows.
+
+    The database already enforces these types, so from_orm_fast() copies the
+    attributes with model_construct() instead of re-validating every field.
+    """
+
+    @classmethod
+    def from_orm_fast(cls, obj, **values):
+        """
+        Build the schema from an ORM instance or result row without validation.
+        Keyword arguments supply (or override) fields the object doesn't carry.
+        """
+        fields = {name: getattr(obj, name, None) for name in cls.model_fields}
+        fields.update(values)
+        return cls.model_construct(**fields)
+
+
+# Controlled vocabularies, shared by the schemas that accept them. StrEnum and
+# IntEnum members compare equal to, bind to SQL as, and format like their
+# values, so routes can treat them as plain strings/ints.
+
+class Phase(StrEnum):
+    A = "A"
+    B = "B"
+    C = "C"
+
+
+class ProbeType(StrEnum):
+    pH = "pH"
+    DO = "DO"
+    Temp = "Temp"
+    OffGas_O2 = "OffGas_O2"
+    OffGas_CO2 = "OffGas_CO2"
+    Pressure = "Pressure"
+
+
+class DeviationLevel(IntEnum):
+    MINOR = 1
+    MAJOR = 2
+    CRITICAL = 3
+
+
+class FailureCategory(StrEnum):
+    Contamination = "Contamination"
+    DO_Crash = "DO_Crash"
+    DO_Crash_No_Control = "DO_Crash_No_Control"
+    pH_Excursion = "pH_Excursion"
+    pH_Drift_No_Control = "pH_Drift_No_Control"
+    Temp_Excursion = "Temp_Excursion"
+    Sensor_Failure = "Sensor_Failure"
+    Power_Outage = "Power_Outage"
+    Sampling_Missed = "Sampling_Missed"
+    O2_Enrichment_Used = "O2_Enrichment_Used"
+    Other = "Other"
+
+
+class BatchOutcome(StrEnum):
+    Complete = "Complete"
+    Aborted_Contamination = "Aborted_Contamination"
+    Aborted_Sensor_Failure = "Aborted_Sensor_Failure"
+    Aborted_Other = "Aborted_Other"
+
+
+class HarvestMethod(StrEnum):
+    Cell_Banking = "Cell_Banking"
+    Disposal = "Disposal"
+
+
+class UserRole(StrEnum):
+    technician = "technician"
+    engineer = "engineer"
+    admin = "admin"
+    read_only = "read_only"
 
 
 # ============================================================================
@@ -17,13 +120,13 @@ from decimal import Decimal
 class BatchCreate(BaseModel):
     """Schema for creating a new batch."""
     batch_number: int = Field(..., ge=1, le=18, description="Batch number (1-18)")
-    phase: Literal["A", "B", "C"] = Field(..., description="Campaign phase")
+    phase: Phase = Field(..., description="Campaign phase")
     vessel_id: str = Field(..., min_length=1, max_length=50, description="Vessel identifier (any format)")
     operator_id: str = Field(..., min_length=1, max_length=50, description="Operator identifier")
     notes: Optional[str] = None
 
 
-class BatchResponse(BaseModel):
+class BatchResponse(FastFromORM, BaseModel):
     """Schema for batch API responses."""
     batch_id: UUID
     batch_number: int
@@ -36,44 +139,27 @@ class BatchResponse(BaseModel):
     inoculated_at: Optional[datetime]
     completed_at: Optional[datetime]
     notes: Optional[str]
+    runtime_hours: Optional[float] = None  # Batch.runtime_hours, computed in SQL
 
-    @computed_field
-    @property
-    def runtime_hours(self) -> Optional[float]:
-        """Calculate batch runtime in hours."""
-        if self.inoculated_at and self.completed_at:
-            delta = self.completed_at - self.inoculated_at
-            return round(delta.total_seconds() / 3600, 2)
-        return None
+    # Filled in by the batches router from the same query as the batch row
+    current_timepoint_hours: Optional[float] = None
+    total_samples_count: int = 0
+    calibrations_count: int = 0
+    critical_failures_count: int = 0
 
-    @computed_field
-    @property
-    def current_timepoint_hours(self) -> Optional[float]:
-        """Calculate current timepoint in hours since inoculation."""
-        if self.inoculated_at:
-            delta = datetime.utcnow() - self.inoculated_at
-            return round(delta.total_seconds() / 3600, 2)
-        return None
-
-    @computed_field
-    @property
-    def total_samples_count(self) -> int:
-        """Count of samples for this batch."""
-        return 0  # Placeholder - will be populated by API route
+    model_config = _RESPONSE_CONFIG
 
-    @computed_field
-    @property
-    def calibrations_count(self) -> int:
-        """Count of calibrations for this batch."""
-        return 0  # Placeholder - will be populated by API route
 
-    @computed_field
-    @property
-    def critical_failures_count(self) -> int:
-        """Count of critical failures for this batch."""
-        return 0  # Placeholder - will be populated by API route
+# List endpoints omit null fields from each item. The *ListItem schemas document
+# that shape for OpenAPI: their nullable fields default to None, so they are
+# not listed as required.
 
-    model_config = {"from_attributes": True}
+class BatchListItem(BatchResponse):
+    """BatchResponse as returned by list_batches."""
+    created_by: Optional[str] = None
+    inoculated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    notes: Optional[str] = None
 
 
 class BatchUpdate(BaseModel):
@@ -86,33 +172,49 @@ class BatchUpdate(BaseModel):
 # MEDIA PREPARATION SCHEMAS
 # ============================================================================
 
+# Standard Fermentation Basal Salts recipe (4% glycerol). Clients only send the
+# quantities that differ from it.
+FERMENTATION_BASAL_RECIPE: Final = MappingProxyType({
+    "recipe_name": "Fermentation_Basal_Salts_4pct_Glycerol",
+    "phosphoric_acid_ml": 26.7,
+    "calcium_sulfate_g": 0.93,
+    "potassium_sulfate_g": 18.2,
+    "magnesium_sulfate_g": 14.9,
+    "potassium_hydroxide_g": 4.13,
+    "glycerol_g": 40.0,
+    "final_volume_l": 0.9,
+})
+
+
 class MediaPreparationCreate(BaseModel):
     """Schema for logging media preparation."""
-    recipe_name: str = "Fermentation_Basal_Salts_4pct_Glycerol"
+    recipe_name: str = FERMENTATION_BASAL_RECIPE["recipe_name"]
 
     # Components
-    phosphoric_acid_ml: Decimal = Field(default=Decimal("26.7"), ge=0)
+    phosphoric_acid_ml: _NonNegative = FERMENTATION_BASAL_RECIPE["phosphoric_acid_ml"]
     phosphoric_acid_lot: Optional[str] = None
-    calcium_sulfate_g: Decimal = Field(default=Decimal("0.93"), ge=0)
+    calcium_sulfate_g: _NonNegative = FERMENTATION_BASAL_RECIPE["calcium_sulfate_g"]
     calcium_sulfate_lot: Optional[str] = None
-    potassium_sulfate_g: Decimal = Field(default=Decimal("18.2"), ge=0)
+    potassium_sulfate_g: _NonNegative = FERMENTATION_BASAL_RECIPE["potassium_sulfate_g"]
     potassium_sulfate_lot: Optional[str] = None
-    magnesium_sulfate_g: Decimal = Field(default=Decimal("14.9"), ge=0)
+    magnesium_sulfate_g: _NonNegative = FERMENTATION_BASAL_RECIPE["magnesium_sulfate_g"]
     magnesium_sulfate_lot: Optional[str] = None
-    potassium_hydroxide_g: Decimal = Field(default=Decimal("4.13"), ge=0)
+    potassium_hydroxide_g: _NonNegative = FERMENTATION_BASAL_RECIPE["potassium_hydroxide_g"]
     potassium_hydroxide_lot: Optional[str] = None
-    glycerol_g: Decimal = Field(default=Decimal("40.0"), ge=0)
+    glycerol_g: _NonNegative = FERMENTATION_BASAL_RECIPE["glycerol_g"]
     glycerol_lot: Optional[str] = None
 
     # Preparation details
-    final_volume_l: Decimal = Field(default=Decimal("0.9"), ge=0)
-    autoclave_cycle: str = Field(..., min_length=1)
+    final_volume_l: _NonNegative = FERMENTATION_BASAL_RECIPE["final_volume_l"]
+    autoclave_cycle: _NonEmptyStr
     sterility_verified: bool = False
-    prepared_by: str = Field(..., min_length=1)
+    prepared_by: _NonEmptyStr
     notes: Optional[str] = None
 
+    model_config = {"allow_inf_nan": False}
 
-class MediaPreparationResponse(BaseModel):
+
+class MediaPreparationResponse(FastFromORM, BaseModel):
     """Schema for media preparation responses."""
     id: int
     batch_id: UUID
@@ -122,13 +224,48 @@ class MediaPreparationResponse(BaseModel):
     prepared_at: datetime
     prepared_by: str
 
-    model_config = {"from_attributes": True}
+    model_config = _RESPONSE_CONFIG
 
 
 # ============================================================================
 # CALIBRATION SCHEMAS
 # ============================================================================
 
+def calculate_ph_slope(low_ref, high_ref, low_read, high_read) -> Optional[float]:
+    """
+    Calculate pH probe slope percentage using Nernst equation.
+
+    Nernst equation at 25°C: E = E₀ - 59.16 mV/pH × pH
+    Ideal slope = 59.16 mV per pH unit
+
+    Example:
+    - pH 4.0 buffer → probe reads -177 mV
+    - pH 7.0 buffer → probe reads 0 mV
+    - delta_mV = 0 - (-177) = 177 mV
+    - delta_pH = 7.0 - 4.0 = 3.0
+    - slope = 177 / 3.0 = 59 mV/pH
+    - slope % = (59 / 59.16) × 100 = 99.7%
+    """
+    # Same rule as the calculate_ph_slope() trigger: a 0 mV reading is valid
+    if None in (low_ref, high_ref, low_read, high_read):
+        return None
+
+    return _ph_slope_percent(low_ref, high_ref, low_read, high_read)
+
+
+@lru_cache(maxsize=4096)
+def _ph_slope_percent(low_ref: float, high_ref: float, low_read: float, high_read: float) -> Optional[float]:
+    """Float core of calculate_ph_slope (buffer sets repeat across batches)."""
+    if math.isclose(high_ref, low_ref):
+        return None  # Avoid division by zero
+
+    # Slope in mV/pH unit
+    measured_slope = (high_read - low_read) / (high_ref - low_ref)
+
+    # Nernst ideal slope: 59.16 mV/pH at 25°C
+    return round(abs(measured_slope) / 59.16 * 100, 1)
+
+
 class CalibrationCreate(BaseModel):
     """
     Schema for logging sensor calibration.
@@ -141,105 +278,69 @@ class CalibrationCreate(BaseModel):
     - OffGas_CO2: Span gas calibration (N2 for 0%, certified span gas for high point)
     - Pressure: Atmospheric reference or certified gauge
     """
-    probe_type: Literal["pH", "DO", "Temp", "OffGas_O2", "OffGas_CO2", "Pressure"]
+    probe_type: ProbeType
 
     # Calibration reference points (terminology adapts to probe type)
     # pH: buffer values (e.g., 4.01, 7.00)
     # DO: saturation % (0%, 100%)
     # Gas sensors: span gas concentrations (0%, 20.9% for O2, etc.)
     # Pressure: reference pressure values
-    buffer_low_value: Optional[Decimal] = Field(None, description="Low calibration point reference value")
+    buffer_low_value: Optional[float] = Field(None, description="Low calibration point reference value")
     buffer_low_lot: Optional[str] = Field(None, description="Lot number for low point reference (buffer/span gas)")
-    buffer_high_value: Optional[Decimal] = Field(None, description="High calibration point reference value")
+    buffer_high_value: Optional[float] = Field(None, description="High calibration point reference value")
     buffer_high_lot: Optional[str] = Field(None, description="Lot number for high point reference (buffer/span gas)")
 
     # Actual readings from probe
-    reading_low: Optional[Decimal] = Field(None, description="Probe reading at low calibration point")
-    reading_high: Optional[Decimal] = Field(None, description="Probe reading at high calibration point")
+    reading_low: Optional[float] = Field(None, description="Probe reading at low calibration point")
+    reading_high: Optional[float] = Field(None, description="Probe reading at high calibration point")
 
     # Performance metrics
     response_time_sec: Optional[int] = Field(None, description="Response time in seconds (primarily for DO probe, should be <30s)")
     pass_: bool = Field(..., alias="pass", description="Did calibration meet acceptance criteria?")
     control_active: bool = Field(default=True, description="Will automated control be active for this batch?")
 
-    calibrated_by: str = Field(..., min_length=1)
+    calibrated_by: _NonEmptyStr
     notes: Optional[str] = Field(None, description="Additional calibration notes (e.g., temperature, span gas cert number)")
 
-    @field_validator("pass_")
-    @classmethod
-    def validate_calibration_pass(cls, v: bool, info) -> bool:
+    @model_validator(mode="after")
+    def validate_calibration_pass(self) -> "CalibrationCreate":
         """Auto-fail if pH slope <95% or DO response >30s."""
-        probe_type = info.data.get("probe_type")
-
-        if probe_type == "pH":
+        if self.probe_type == ProbeType.pH:
             # pH probes must have ≥95% slope
-            slope_pct = cls._calculate_ph_slope(
-                info.data.get("buffer_low_value"),
-                info.data.get("buffer_high_value"),
-                info.data.get("reading_low"),
-                info.data.get("reading_high")
+            slope_pct = calculate_ph_slope(
+                self.buffer_low_value, self.buffer_high_value, self.reading_low, self.reading_high
             )
-            if slope_pct and slope_pct < 95.0:
-                return False
+            if slope_pct is not None and slope_pct < 95.0:
+                self.pass_ = False
 
-        elif probe_type == "DO":
+        elif self.probe_type == ProbeType.DO:
             # DO probes must respond in <30 seconds
-            response_time = info.data.get("response_time_sec")
-            if response_time and response_time > 30:
-                return False
+            if self.response_time_sec and self.response_time_sec > 30:
+                self.pass_ = False
 
-        return v
+        return self
 
-    @staticmethod
-    def _calculate_ph_slope(low_ref, high_ref, low_read, high_read) -> Optional[float]:
-        """
-        Calculate pH probe slope percentage using Nernst equation.
-
-        Nernst equation at 25°C: E = E₀ - 59.16 mV/pH × pH
-        Ideal slope = 59.16 mV per pH unit
-
-        Example:
-        - pH 4.0 buffer → probe reads -177 mV
-        - pH 7.0 buffer → probe reads 0 mV
-        - delta_mV = 0 - (-177) = 177 mV
-        - delta_pH = 7.0 - 4.0 = 3.0
-        - slope = 177 / 3.0 = 59 mV/pH
-        - slope % = (59 / 59.16) × 100 = 99.7%
-        """
-        if not all([low_ref, high_ref, low_read, high_read]):
-            return None
+    model_config = {"populate_by_name": True, "allow_inf_nan": False}
 
-        delta_pH = float(high_ref) - float(low_ref)
-        delta_mV = float(high_read) - float(low_read)
 
-        if delta_pH == 0:
-            return None  # Avoid division by zero
-
-        # Slope in mV/pH unit
-        measured_slope = delta_mV / delta_pH
-
-        # Nernst ideal slope: 59.16 mV/pH at 25°C
-        ideal_slope = 59.16
-
-        # Slope percentage
-        slope_pct = (abs(measured_slope) / ideal_slope) * 100
-        return round(slope_pct, 1)
-
-    model_config = {"populate_by_name": True}
-
-
-class CalibrationResponse(BaseModel):
+class CalibrationResponse(FastFromORM, BaseModel):
     """Schema for calibration responses."""
     id: int
     batch_id: UUID
     probe_type: str
-    slope_percent: Optional[Decimal]
+    slope_percent: Optional[float]
     response_time_sec: Optional[int]
     pass_: bool = Field(..., alias="pass")
     calibrated_at: datetime
     calibrated_by: str
 
-    model_config = {"from_attributes": True, "populate_by_name": True}
+    model_config = _RESPONSE_CONFIG
+
+
+class CalibrationListItem(CalibrationResponse):
+    """CalibrationResponse as returned by list_calibrations (see BatchListItem)."""
+    slope_percent: Optional[float] = None
+    response_time_sec: Optional[int] = None
 
 
 # ============================================================================
@@ -259,12 +360,12 @@ class InoculationCreate(BaseModel):
         None,
         description="Source description (e.g., 'Cryo-2024-001', 'Plate YPD-5', 'Seed Flask A')"
     )
-    inoculum_od600: Decimal = Field(..., ge=Decimal("0.1"), description="Final inoculum OD600 (typical range: 2-6)")
-    dilution_factor: Decimal = Field(default=Decimal("1.0"), ge=Decimal("1.0"))
-    inoculum_volume_ml: Decimal = Field(default=Decimal("100.0"), ge=0)
+    inoculum_od600: float = Field(..., ge=0.1, description="Final inoculum OD600 (typical range: 2-6)")
+    dilution_factor: _Dilution = 1.0
+    inoculum_volume_ml: _NonNegative = 100.0
     microscopy_observations: Optional[str] = Field(None, description="Cell morphology, viability observations")
     go_decision: bool = Field(..., description="GO/NO-GO decision to proceed with inoculation")
-    inoculated_by: str = Field(..., min_length=1)
+    inoculated_by: _NonEmptyStr
 
     @field_validator("go_decision")
     @classmethod
@@ -274,27 +375,29 @@ class InoculationCreate(BaseModel):
 
         # Typical range is 2.0-6.0, but allow any positive OD with GO decision
         if v and od:
-            if od < Decimal("0.5"):
+            if od < 0.5:
                 # Very low OD - technician should justify in microscopy_observations
                 pass
-            elif od > Decimal("10.0"):
+            elif od > 10.0:
                 # Very high OD - may indicate over-growth
                 pass
 
         return v
 
+    model_config = {"allow_inf_nan": False}
 
-class InoculationResponse(BaseModel):
+
+class InoculationResponse(FastFromORM, BaseModel):
     """Schema for inoculation responses."""
     id: int
     batch_id: UUID
     inoculum_source: Optional[str]
-    inoculum_od600: Decimal
+    inoculum_od600: float
     go_decision: bool
     inoculated_at: datetime
     inoculated_by: str
 
-    model_config = {"from_attributes": True}
+    model_config = _RESPONSE_CONFIG
 
 
 # ============================================================================
@@ -303,17 +406,17 @@ class InoculationResponse(BaseModel):
 
 class SampleCreate(BaseModel):
     """Schema for logging in-process sample."""
-    sample_volume_ml: Decimal = Field(default=Decimal("10.0"), ge=0)
+    sample_volume_ml: _NonNegative = 10.0
 
     # OD600
-    od600_raw: Decimal = Field(..., ge=0)
-    od600_dilution_factor: Decimal = Field(default=Decimal("1.0"), ge=Decimal("1.0"))
+    od600_raw: _NonNegative
+    od600_dilution_factor: _Dilution = 1.0
 
     # DCW (optional)
     dcw_filter_id: Optional[str] = None
-    dcw_sample_volume_ml: Optional[Decimal] = Field(None, ge=0)
-    dcw_filter_wet_weight_g: Optional[Decimal] = Field(None, ge=0)
-    dcw_filter_dry_weight_g: Optional[Decimal] = Field(None, ge=0)
+    dcw_sample_volume_ml: Optional[_NonNegative] = None
+    dcw_filter_wet_weight_g: Optional[_NonNegative] = None
+    dcw_filter_dry_weight_g: Optional[_NonNegative] = None
 
     # Quality
     contamination_detected: bool = False
@@ -323,28 +426,33 @@ class SampleCreate(BaseModel):
     supernatant_cryovial_id: Optional[str] = None
     pellet_cryovial_id: Optional[str] = None
 
-    sampled_by: str = Field(..., min_length=1)
+    sampled_by: _NonEmptyStr
 
-    @computed_field
-    @property
-    def od600_calculated(self) -> Decimal:
-        """Auto-calculate final OD600."""
-        return self.od600_raw * self.od600_dilution_factor
+    # Measurements are plain floats (the NUMERIC columns round them to scale);
+    # like Decimal, reject NaN/inf
+    model_config = {"allow_inf_nan": False}
 
 
-class SampleResponse(BaseModel):
+class SampleResponse(FastFromORM, BaseModel):
     """Schema for sample responses."""
     id: int
     batch_id: UUID
-    timepoint_hours: Optional[Decimal]
-    od600_raw: Decimal
-    od600_calculated: Optional[Decimal]
-    dcw_g_per_l: Optional[Decimal]
+    timepoint_hours: Optional[float]
+    od600_raw: float
+    od600_calculated: Optional[float]
+    dcw_g_per_l: Optional[float]
     contamination_detected: bool
     sampled_at: datetime
     sampled_by: str
 
-    model_config = {"from_attributes": True}
+    model_config = _RESPONSE_CONFIG
+
+
+class SampleListItem(SampleResponse):
+    """SampleResponse as returned by list_samples (see BatchListItem)."""
+    timepoint_hours: Optional[float] = None
+    od600_calculated: Optional[float] = None
+    dcw_g_per_l: Optional[float] = None
 
 
 # ============================================================================
@@ -353,27 +461,22 @@ class SampleResponse(BaseModel):
 
 class FailureCreate(BaseModel):
     """Schema for logging deviation/failure."""
-    deviation_level: Literal[1, 2, 3]
+    deviation_level: DeviationLevel
     deviation_start_time: datetime
     deviation_end_time: Optional[datetime] = None
 
-    category: Literal[
-        "Contamination", "DO_Crash", "DO_Crash_No_Control",
-        "pH_Excursion", "pH_Drift_No_Control", "Temp_Excursion",
-        "Sensor_Failure", "Power_Outage", "Sampling_Missed",
-        "O2_Enrichment_Used", "Other"
-    ]
+    category: FailureCategory
 
     description: str = Field(..., min_length=10)
     root_cause: Optional[str] = None
     corrective_action: Optional[str] = None
     impact_assessment: Optional[str] = None
 
-    reported_by: str = Field(..., min_length=1)
+    reported_by: _NonEmptyStr
     reviewed_by: Optional[str] = None
 
 
-class FailureResponse(BaseModel):
+class FailureResponse(FastFromORM, BaseModel):
     """Schema for failure responses."""
     id: int
     batch_id: UUID
@@ -384,7 +487,23 @@ class FailureResponse(BaseModel):
     reported_by: str
     reviewed_by: Optional[str]
 
-    model_config = {"from_attributes": True}
+    model_config = _RESPONSE_CONFIG
+
+
+class FailureListItem(FailureResponse):
+    """FailureResponse as returned by list_failures (see BatchListItem)."""
+    reviewed_by: Optional[str] = None
+
+
+# ============================================================================
+# BATCH DETAIL SCHEMAS
+# ============================================================================
+
+class BatchDetailResponse(BatchResponse):
+    """Batch response plus the child records requested via get_batch's `include`."""
+    samples: Optional[List[SampleResponse]] = None
+    calibrations: Optional[List[CalibrationResponse]] = None
+    failures: Optional[List[FailureResponse]] = None
 
 
 # ============================================================================
@@ -393,34 +512,34 @@ class FailureResponse(BaseModel):
 
 class BatchClosureCreate(BaseModel):
     """Schema for closing a batch."""
-    final_od600: Decimal = Field(..., ge=0)
-    total_runtime_hours: Decimal = Field(..., ge=0)
-    glycerol_depletion_time_hours: Decimal = Field(..., ge=0)
+    final_od600: _NonNegativeDecimal
+    total_runtime_hours: _NonNegativeDecimal
+    glycerol_depletion_time_hours: _NonNegativeDecimal
 
     do_spike_observed: bool = True
-    max_do_percent: Optional[Decimal] = Field(None, ge=0, le=100)
+    max_do_percent: Optional[_PercentDecimal] = None
 
-    cumulative_base_addition_ml: Optional[Decimal] = Field(None, ge=0)
+    cumulative_base_addition_ml: Optional[_NonNegativeDecimal] = None
 
-    outcome: Literal["Complete", "Aborted_Contamination", "Aborted_Sensor_Failure", "Aborted_Other"]
-    harvest_method: Optional[Literal["Cell_Banking", "Disposal"]] = None
+    outcome: BatchOutcome
+    harvest_method: Optional[HarvestMethod] = None
 
-    closed_by: str = Field(..., min_length=1)
-    approved_by: str = Field(..., min_length=1, description="Process Engineer approval required")
+    closed_by: _NonEmptyStr
+    approved_by: _NonEmptyStr = Field(..., description="Process Engineer approval required")
     notes: Optional[str] = None
 
 
-class BatchClosureResponse(BaseModel):
+class BatchClosureResponse(FastFromORM, BaseModel):
     """Schema for batch closure responses."""
     id: int
     batch_id: UUID
-    final_od600: Decimal
-    total_runtime_hours: Decimal
+    final_od600: float
+    total_runtime_hours: float
     outcome: str
     closed_at: datetime
     approved_by: str
 
-    model_config = {"from_attributes": True}
+    model_config = _RESPONSE_CONFIG
 
 
 # ============================================================================
@@ -429,29 +548,29 @@ class BatchClosureResponse(BaseModel):
 
 class UserCreate(BaseModel):
     """Schema for creating a new user."""
-    username: str = Field(..., min_length=3, max_length=50)
+    # pydantic-core compiles `pattern` once, to Rust's linear-time regex engine
+    username: str = Field(..., min_length=3, max_length=50, pattern=r"^[A-Za-z0-9_.-]+$")
     password: str = Field(..., min_length=8)
-    role: Literal["technician", "engineer", "admin", "read_only"]
+    role: UserRole
     full_name: Optional[str] = None
 
 
-class UserResponse(BaseModel):
+class UserResponse(FastFromORM, BaseModel):
     """Schema for user responses (no password)."""
-    user_id: int
+    # User rows call this column 'id'
+    user_id: int = Field(..., validation_alias=AliasChoices("user_id", "id"))
     username: str
     role: str
     full_name: Optional[str]
     active: bool
 
-    model_config = {"from_attributes": True}
-    
+    model_config = _RESPONSE_CONFIG
+
     @classmethod
-    def from_orm(cls, obj):
-        """Map database 'id' field to 'user_id' for API responses."""
-        data = obj.__dict__.copy() if hasattr(obj, '__dict__') else obj
-        if 'id' in data:
-            data['user_id'] = data.pop('id')
-        return cls(**data)
+    def from_orm_fast(cls, obj, **values):
+        """Map the database 'id' column to 'user_id' for API responses."""
+        values.setdefault("user_id", obj.id)
+        return super().from_orm_fast(obj, **values)
 
 
 class Token(BaseModel):
@@ -459,6 +578,8 @@ class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
+    model_config = _RESPONSE_CONFIG
+
 
 class TokenData(BaseModel):
     """Schema for decoded JWT token data."""
@@ -485,9 +606,31 @@ class ErrorResponse(BaseModel):
     timestamp: datetime
     path: str
 
+    model_config = _RESPONSE_CONFIG
+
 
 class ValidationErrorDetail(BaseModel):
     """Pydantic validation error detail."""
-    loc: list[str]
+    loc: tuple[Union[str, int], ...]  # List items are located by index
     msg: str
     type: str
+
+    model_config = _RESPONSE_CONFIG
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def apply_schema(orm_obj, schema: BaseModel):
+    """
+    Copy the fields a client actually sent from a validated schema onto an ORM
+    instance (same result as `Model(**schema.model_dump(exclude_unset=True))`,
+    without building the intermediate dict).
+
+    Unset fields are left to the ORM/database defaults. Schema field names match
+    the ORM attribute names (including `pass_` on calibrations).
+    """
+    for name in schema.model_fields_set:
+        setattr(orm_obj, name, getattr(schema, name))
+    return orm_obj
@@ -0,0 +1,21 @@
+"""
+Security helpers shared across the API.
+Use these instead of raw `==` when comparing secrets (API keys, tokens, digests).
+"""
+
+import hmac
+from typing import Union
+
+
+def safe_eq(a: Union[str, bytes], b: Union[str, bytes]) -> bool:
+    """
+    Constant-time equality check for secrets.
+
+    Takes the same time regardless of where the inputs first differ, so
+    comparisons don't leak how much of a guessed secret was correct.
+    """
+    if isinstance(a, str):
+        a = a.encode()
+    if isinstance(b, str):
+        b = b.encode()
+    return hmac.compare_digest(a, b)
@@ -0,0 +1,42 @@
+"""
+Request coalescing for expensive read-only work.
+Concurrent callers asking for the same key share one in-flight computation.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await that same task instead of repeating it. Once the task
+    finishes the key is forgotten, so later calls start fresh work (pair with
+    a cache if results should outlive the flight).
+
+    Usage:
+        _flights = SingleFlight()
+        report = await _flights.do(("report", batch_id), lambda: build_report(batch_id))
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `fn()`, sharing it with concurrent calls for `key`."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shielded so one caller going away doesn't cancel the work for the rest
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved; waiting callers re-raise it themselves
@@ -33,10 +33,11 @@ CREATE TABLE batches (
 );
 
 -- Indexes
-CREATE INDEX idx_batches_phase ON batches(phase);
+CREATE INDEX idx_batches_phase_status_created ON batches(phase, status, created_at DESC, batch_id DESC);
 CREATE INDEX idx_batches_status ON batches(status);
-CREATE INDEX idx_batches_vessel ON batches(vessel_id);
-CREATE INDEX idx_batches_created_at ON batches(created_at DESC);
+CREATE INDEX idx_batches_vessel_created ON batches(vessel_id, created_at DESC, batch_id DESC);
+CREATE INDEX idx_batches_vessel_active ON batches(vessel_id) WHERE status IN ('pending', 'running');
+CREATE INDEX idx_batches_created_at_id ON batches(created_at DESC, batch_id DESC);
 
 COMMENT ON TABLE batches IS 'Core batch records - SSoT for all manual data';
 
@@ -117,6 +118,7 @@ CREATE TABLE calibrations (
 
 CREATE INDEX idx_calibrations_batch ON calibrations(batch_id);
 CREATE INDEX idx_calibrations_probe_type ON calibrations(batch_id, probe_type);
+CREATE INDEX idx_calibrations_failed ON calibrations(batch_id) WHERE pass = false;
 
 COMMENT ON TABLE calibrations IS 'Pre-run sensor calibration records (pH, DO, off-gas, pressure)';
 
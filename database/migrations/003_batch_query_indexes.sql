@@ -0,0 +1,32 @@
+-- ============================================================================
+-- Migration: Batch Query Indexes
+-- Version: 003
+-- Date: 2026-10-15
+-- Description: Indexes matching the API's hot batch predicates
+-- ============================================================================
+
+-- Changes:
+-- 1. Composite (phase, status) index for filtered batch listings
+--    (replaces idx_batches_phase, which is its leading column)
+-- 2. Partial vessel index over active batches only, backing the
+--    "vessel already has a pending/running batch" check in create_batch
+--
+-- Already covered by init.sql:
+-- - (batch_number, phase): unique_batch_per_phase constraint index
+-- - ORDER BY created_at DESC: idx_batches_created_at
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_batches_phase_status
+    ON batches(phase, status);
+
+DROP INDEX IF EXISTS idx_batches_phase;
+
+-- Few batches are active at once, so this stays tiny
+CREATE INDEX IF NOT EXISTS idx_batches_vessel_active
+    ON batches(vessel_id)
+    WHERE status IN ('pending', 'running');
+
+COMMIT;
+
+SELECT 'Migration 003 completed successfully! Batch query indexes created.' AS status;
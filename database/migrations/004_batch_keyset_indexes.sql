@@ -0,0 +1,37 @@
+-- ============================================================================
+-- Migration: Batch Keyset Pagination Indexes
+-- Version: 004
+-- Date: 2026-10-15
+-- Description: Indexes matching list_batches' ORDER BY created_at DESC, batch_id DESC
+-- ============================================================================
+
+-- Changes:
+-- 1. (created_at DESC, batch_id DESC) for unfiltered listings and cursor seeks
+--    (replaces idx_batches_created_at)
+-- 2. (phase, status, created_at DESC, batch_id DESC) for filtered listings
+--    (replaces idx_batches_phase_status from migration 003)
+-- 3. (vessel_id, created_at DESC, batch_id DESC) for per-vessel listings
+--    (replaces idx_batches_vessel)
+--
+-- Each filter + sort combination becomes a bounded index range scan, with no
+-- separate sort step, at any page depth.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_batches_created_at_id
+    ON batches(created_at DESC, batch_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_batches_phase_status_created
+    ON batches(phase, status, created_at DESC, batch_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_batches_vessel_created
+    ON batches(vessel_id, created_at DESC, batch_id DESC);
+
+-- Superseded: each is a leading prefix of one of the indexes above
+DROP INDEX IF EXISTS idx_batches_created_at;
+DROP INDEX IF EXISTS idx_batches_phase_status;
+DROP INDEX IF EXISTS idx_batches_vessel;
+
+COMMIT;
+
+SELECT 'Migration 004 completed successfully! Keyset pagination indexes created.' AS status;
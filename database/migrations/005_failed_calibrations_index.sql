@@ -0,0 +1,23 @@
+-- ============================================================================
+-- Migration: Failed Calibrations Partial Index
+-- Version: 005
+-- Date: 2026-10-15
+-- Description: Partial index for the inoculation pre-check's failed-probe lookup
+-- ============================================================================
+
+-- Changes:
+-- 1. Partial index on calibrations(batch_id) WHERE pass = false
+--
+-- create_inoculation only needs the failing calibrations of a batch. With this
+-- index the lookup is a single-page probe that finds nothing in the common
+-- case (all probes passed), instead of scanning every calibration row.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_calibrations_failed
+    ON calibrations(batch_id)
+    WHERE pass = false;
+
+COMMIT;
+
+SELECT 'Migration 005 completed successfully! Failed calibrations index created.' AS status;
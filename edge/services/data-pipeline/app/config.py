@@ -1,60 +1,68 @@
 """
 Configuration management for data pipeline service
 """
-import os
-from typing import Dict, Any
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# Physically possible (min, max) per sensor tag. Built once at import and
+# exposed read-only, so Settings() neither validates nor copies it.
+_PHYSICAL_BOUNDS: Mapping[str, Tuple[float, float]] = MappingProxyType({
+    "pH": (2.0, 10.0),
+    "DO": (0.0, 100.0),
+    "OD": (0.0, 100.0),
+    "Temp_Broth": (20.0, 40.0),
+    "Temp_pH_Probe": (20.0, 40.0),
+    "Temp_DO_Probe": (20.0, 40.0),
+    "Temp_Stirrer_Motor": (15.0, 100.0),
+    "Temp_Exhaust": (20.0, 50.0),
+    "Gas_MFC_air": (0.0, 3.0),
+    "Stir_SP": (0.0, 1200.0),
+    "Stir_torque": (0.0, 100.0),
+    "Reactor_Pressure": (0.8, 1.6),
+    "Weight": (0.0, 15.0),
+    "Heater_PID_out": (0.0, 100.0),
+    "Base_Pump_Rate": (0.0, 15.0),
+    "Off_Gas_CO2": (0.0, 10.0),
+    "Off_Gas_O2": (15.0, 25.0),
+    "Gas_Flow_Inlet": (0.0, 3.0),
+    "Gas_Flow_Outlet": (0.0, 3.5),
+})
 
 
 class Settings(BaseSettings):
-    """Pipeline service configuration"""
+    """Pipeline service configuration (each field is read from its upper-case env var)"""
+
+    model_config = SettingsConfigDict(case_sensitive=False, env_file=".env")
 
     # MQTT Configuration
-    mqtt_broker: str = os.getenv("MQTT_BROKER", "mosquitto")
-    mqtt_port: int = int(os.getenv("MQTT_PORT", "1883"))
-    mqtt_username: str = os.getenv("MQTT_USERNAME", "")
-    mqtt_password: str = os.getenv("MQTT_PASSWORD", "")
+    mqtt_broker: str = "mosquitto"
+    mqtt_port: int = 1883
+    mqtt_username: Optional[str] = None  # None: connect anonymously
+    mqtt_password: Optional[str] = None
 
     # InfluxDB Configuration
-    influx_url: str = os.getenv("INFLUX_URL", "http://influxdb:8086")
-    influx_token: str = os.getenv("INFLUX_TOKEN", "my-super-secret-auth-token")
-    influx_org: str = os.getenv("INFLUX_ORG", "bioprocess")
-    influx_bucket_raw: str = os.getenv("INFLUX_BUCKET_RAW", "pichia_raw")
-    influx_bucket_30s: str = os.getenv("INFLUX_BUCKET_30S", "pichia_30s")
-    influx_bucket_pred: str = os.getenv("INFLUX_BUCKET_PRED", "pichia_pred")
+    influx_url: str = "http://influxdb:8086"
+    influx_token: str = "my-super-secret-auth-token"
+    influx_org: str = "bioprocess"
+    influx_bucket_raw: str = "pichia_raw"
+    influx_bucket_30s: str = "pichia_30s"
+    influx_bucket_pred: str = "pichia_pred"
 
     # Pipeline Configuration
-    window_size_seconds: int = int(os.getenv("WINDOW_SIZE_SECONDS", "30"))
-    processing_interval_seconds: int = int(os.getenv("PROCESSING_INTERVAL_SECONDS", "30"))
-    vessel_id: str = os.getenv("VESSEL_ID", "vessel1")
+    window_size_seconds: int = 30
+    processing_interval_seconds: int = 30
+    vessel_id: str = "vessel1"
 
     # Data Quality Thresholds
     max_missing_duration_interpolate_minutes: int = 5  # Linear interpolation
     max_missing_duration_kalman_minutes: int = 30      # Kalman filter
     outlier_zscore_threshold: float = 3.0              # Z-score for outlier detection
 
-    # Physical Bounds for Validation
-    physical_bounds: Dict[str, Dict[str, float]] = {
-        "pH": {"min": 2.0, "max": 10.0},
-        "DO": {"min": 0.0, "max": 100.0},
-        "OD": {"min": 0.0, "max": 100.0},
-        "Temp_Broth": {"min": 20.0, "max": 40.0},
-        "Temp_pH_Probe": {"min": 20.0, "max": 40.0},
-        "Temp_DO_Probe": {"min": 20.0, "max": 40.0},
-        "Temp_Stirrer_Motor": {"min": 15.0, "max": 100.0},
-        "Temp_Exhaust": {"min": 20.0, "max": 50.0},
-        "Gas_MFC_air": {"min": 0.0, "max": 3.0},
-        "Stir_SP": {"min": 0.0, "max": 1200.0},
-        "Stir_torque": {"min": 0.0, "max": 100.0},
-        "Reactor_Pressure": {"min": 0.8, "max": 1.6},
-        "Weight": {"min": 0.0, "max": 15.0},
-        "Heater_PID_out": {"min": 0.0, "max": 100.0},
-        "Base_Pump_Rate": {"min": 0.0, "max": 15.0},
-        "Off_Gas_CO2": {"min": 0.0, "max": 10.0},
-        "Off_Gas_O2": {"min": 15.0, "max": 25.0},
-        "Gas_Flow_Inlet": {"min": 0.0, "max": 3.0},
-        "Gas_Flow_Outlet": {"min": 0.0, "max": 3.5},
-    }
+    # Physical Bounds for Validation (shared, read-only; see _PHYSICAL_BOUNDS)
+    physical_bounds: ClassVar[Mapping[str, Tuple[float, float]]] = _PHYSICAL_BOUNDS
 
     # Process Constants
     working_volume_l: float = 0.9
@@ -62,11 +70,15 @@ class Settings(BaseSettings):
     air_o2_fraction: float = 0.21
 
     # Logging
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_level: str = "INFO"
 
-    class Config:
-        case_sensitive = False
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Process-wide Settings, read from the environment on first use.
 
-# Global settings instance
-settings = Settings()
+    Usable as a FastAPI dependency (Depends(get_settings)); tests can
+    override it there or call get_settings.cache_clear() to re-read the env.
+    """
+    return Settings()
@@ -14,7 +14,7 @@ from typing import Dict, Tuple, Optional
 from scipy import interpolate
 from pykalman import KalmanFilter
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ class DataCleaner:
     """Real-time data cleaning and validation"""
 
     def __init__(self):
-        self.settings = settings
+        self.settings = get_settings()
         self.quality_stats = {
             "missing_count": 0,
             "outlier_count": 0,
@@ -211,11 +211,12 @@ class DataCleaner:
             # No bounds defined for this tag
             return df, report
 
-        min_val = bounds["min"]
-        max_val = bounds["max"]
+        min_val, max_val = bounds
 
-        # Check for physically impossible values
-        invalid_mask = (df["_value"] < min_val) | (df["_value"] > max_val)
+        # Check for physically impossible values (on the raw array: no Series
+        # alignment or index bookkeeping per comparison)
+        values = df["_value"].to_numpy(dtype=float)
+        invalid_mask = (values < min_val) | (values > max_val)
         invalid_count = invalid_mask.sum()
 
         if invalid_count > 0:
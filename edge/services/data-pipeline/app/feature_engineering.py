@@ -15,7 +15,7 @@ from typing import Dict, Optional, Tuple
 from scipy.signal import savgol_filter
 from scipy.stats import linregress
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ class FeatureEngineer:
     """Real-time feature engineering from 30-second windows"""
 
     def __init__(self):
-        self.settings = settings
+        self.settings = get_settings()
         self.history = {}  # Store historical values for cumulative features
 
     def engineer_features(self, windows: Dict[str, pd.DataFrame]) -> Dict[str, float]:
@@ -8,7 +8,7 @@ import pandas as pd
 from influxdb_client import InfluxDBClient
 from influxdb_client.client.query_api import QueryApi
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +17,11 @@ class InfluxClient:
     """Client for querying InfluxDB sensor data"""
 
     def __init__(self):
+        self.settings = get_settings()
         self.client = InfluxDBClient(
-            url=settings.influx_url,
-            token=settings.influx_token,
-            org=settings.influx_org,
+            url=self.settings.influx_url,
+            token=self.settings.influx_token,
+            org=self.settings.influx_org,
         )
         self.query_api: QueryApi = self.client.query_api()
 
@@ -39,7 +40,7 @@ class InfluxClient:
             DataFrame with columns ['_time', '_value']
         """
         if bucket is None:
-            bucket = settings.influx_bucket_raw
+            bucket = self.settings.influx_bucket_raw
 
         # Build Flux query
         query = f'''
@@ -47,7 +48,7 @@ class InfluxClient:
           |> range(start: -{duration_seconds}s)
           |> filter(fn: (r) => r._measurement == "{tag}")
           |> filter(fn: (r) => r._field == "_value" or r._field == "value")
-          |> filter(fn: (r) => r.vessel == "{settings.vessel_id}")
+          |> filter(fn: (r) => r.vessel == "{self.settings.vessel_id}")
           |> keep(columns: ["_time", "_value"])
           |> sort(columns: ["_time"])
         '''
@@ -115,15 +116,15 @@ class InfluxClient:
             for feature_name, value in features.items():
                 if pd.notna(value):  # Skip NaN values
                     line = (
-                        f"features,vessel={settings.vessel_id} "
+                        f"features,vessel={self.settings.vessel_id} "
                         f"{feature_name}={value} {int(timestamp.timestamp() * 1e9)}"
                     )
                     lines.append(line)
 
             if lines:
                 write_api.write(
-                    bucket=settings.influx_bucket_pred,
-                    org=settings.influx_org,
+                    bucket=self.settings.influx_bucket_pred,
+                    org=self.settings.influx_org,
                     record=lines,
                 )
                 logger.debug(f"Wrote {len(lines)} features to InfluxDB")
@@ -153,7 +154,7 @@ class InfluxClient:
 
         try:
             line = (
-                f"prediction,vessel={settings.vessel_id} "
+                f"prediction,vessel={self.settings.vessel_id} "
                 f"od_predicted={prediction},"
                 f"confidence_lower={confidence_lower},"
                 f"confidence_upper={confidence_upper} "
@@ -161,8 +162,8 @@ class InfluxClient:
             )
 
             write_api.write(
-                bucket=settings.influx_bucket_pred,
-                org=settings.influx_org,
+                bucket=self.settings.influx_bucket_pred,
+                org=self.settings.influx_org,
                 record=line,
             )
             logger.debug(f"Wrote prediction: OD={prediction:.4f}")
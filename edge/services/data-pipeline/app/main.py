@@ -8,17 +8,17 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Optional
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import uvicorn
 
-from .config import settings
+from .config import Settings, get_settings
 from .pipeline import DataPipeline
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, settings.log_level),
+    level=getattr(logging, get_settings().log_level),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
@@ -116,7 +116,9 @@ async def get_status():
 
 
 @app.post("/start")
-async def start_pipeline(background_tasks: BackgroundTasks):
+async def start_pipeline(
+    background_tasks: BackgroundTasks, settings: Settings = Depends(get_settings)
+):
     """Start the data pipeline"""
     global pipeline_task
 
@@ -201,7 +203,7 @@ async def get_quality_stats():
 
 
 @app.get("/config")
-async def get_config():
+async def get_config(settings: Settings = Depends(get_settings)):
     """Get current pipeline configuration"""
     return {
         "window_size_seconds": settings.window_size_seconds,
@@ -210,7 +212,10 @@ async def get_config():
         "influx_bucket_raw": settings.influx_bucket_raw,
         "influx_bucket_30s": settings.influx_bucket_30s,
         "influx_bucket_pred": settings.influx_bucket_pred,
-        "physical_bounds": settings.physical_bounds,
+        "physical_bounds": {
+            tag: {"min": min_val, "max": max_val}
+            for tag, (min_val, max_val) in settings.physical_bounds.items()
+        },
     }
 
 
@@ -233,5 +238,5 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8001,
         reload=False,
-        log_level=settings.log_level.lower(),
+        log_level=get_settings().log_level.lower(),
     )
@@ -8,7 +8,7 @@ from datetime import datetime
 from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 import paho.mqtt.client as mqtt
 
-from .config import settings
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +67,7 @@ class MonitoringService:
     """Service for monitoring pipeline health and sending alerts"""
 
     def __init__(self):
+        self.settings = get_settings()
         self.mqtt_client: Optional[mqtt.Client] = None
         self.alerts_enabled = True
         self._setup_mqtt()
@@ -76,15 +77,15 @@ class MonitoringService:
         try:
             self.mqtt_client = mqtt.Client(client_id="pipeline-monitor")
 
-            # Set up authentication if configured
-            if settings.mqtt_username and settings.mqtt_password:
-                self.mqtt_client.username_pw_set(settings.mqtt_username, settings.mqtt_password)
+            # Set up authentication if configured (once; publishes reuse the session)
+            if self.settings.mqtt_username is not None:
+                self.mqtt_client.username_pw_set(self.settings.mqtt_username, self.settings.mqtt_password)
 
             # Connect to broker
-            self.mqtt_client.connect(settings.mqtt_broker, settings.mqtt_port, keepalive=60)
+            self.mqtt_client.connect(self.settings.mqtt_broker, self.settings.mqtt_port, keepalive=60)
             self.mqtt_client.loop_start()
 
-            logger.info(f"MQTT client connected to {settings.mqtt_broker}:{settings.mqtt_port}")
+            logger.info(f"MQTT client connected to {self.settings.mqtt_broker}:{self.settings.mqtt_port}")
 
         except Exception as e:
             logger.error(f"Failed to connect to MQTT broker: {e}")
@@ -161,12 +162,12 @@ class MonitoringService:
             "level": level,
             "category": category,
             "message": message,
-            "vessel": settings.vessel_id,
+            "vessel": self.settings.vessel_id,
             "metadata": metadata or {},
         }
 
         try:
-            topic = f"bioprocess/pichia/{settings.vessel_id}/alarms/{category}"
+            topic = f"bioprocess/pichia/{self.settings.vessel_id}/alarms/{category}"
             self.mqtt_client.publish(topic, str(alert_payload), qos=1)
             logger.info(f"Alert sent: [{level}] {message}")
 
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Dict, Optional
 import pandas as pd
 
-from .config import settings
+from .config import get_settings
 from .data_cleaning import DataCleaner
 from .feature_engineering import FeatureEngineer
 from .influx_client import InfluxClient, ALL_SENSOR_TAGS
@@ -20,6 +20,7 @@ class DataPipeline:
     """Main pipeline orchestrator for real-time data processing"""
 
     def __init__(self):
+        self.settings = get_settings()
         self.influx = InfluxClient()
         self.cleaner = DataCleaner()
         self.engineer = FeatureEngineer()
@@ -39,7 +40,7 @@ class DataPipeline:
             # 1. Fetch 30s windows for all sensors
             logger.debug("Fetching sensor windows from InfluxDB...")
             raw_windows = self.influx.get_all_sensor_windows(
-                tags=ALL_SENSOR_TAGS, duration_seconds=settings.window_size_seconds
+                tags=ALL_SENSOR_TAGS, duration_seconds=self.settings.window_size_seconds
             )
 
             # 2. Clean and validate each sensor window
@@ -102,7 +103,7 @@ class DataPipeline:
         """Run the pipeline continuously with configured interval"""
         self.is_running = True
         logger.info(
-            f"Starting continuous pipeline (interval={settings.processing_interval_seconds}s)"
+            f"Starting continuous pipeline (interval={self.settings.processing_interval_seconds}s)"
         )
 
         while self.is_running:
@@ -111,7 +112,7 @@ class DataPipeline:
                 features = self.process_window()
 
                 # Wait for next cycle
-                time.sleep(settings.processing_interval_seconds)
+                time.sleep(self.settings.processing_interval_seconds)
 
             except KeyboardInterrupt:
                 logger.info("Pipeline interrupted by user")
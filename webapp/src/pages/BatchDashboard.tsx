@@ -364,7 +364,7 @@ export const BatchDashboard: React.FC = () => {
                       <span>
                         High: {cal.buffer_high_value} → {cal.reading_high}
                       </span>
-                      {cal.slope_percent !== null && (
+                      {cal.slope_percent != null && (
                         <span>Slope: {Number(cal.slope_percent).toFixed(2)}%</span>
                       )}
                     </div>
@@ -463,10 +463,10 @@ export const BatchDashboard: React.FC = () => {
                   <tbody>
                     {samples.map((sample) => (
                       <tr key={sample.id}>
-                        <td>{Number(sample.timepoint_hours).toFixed(1)}</td>
+                        <td>{sample.timepoint_hours != null ? Number(sample.timepoint_hours).toFixed(1) : 'N/A'}</td>
                         <td>{Number(sample.od600_raw).toFixed(2)}</td>
                         <td>{sample.od600_dilution_factor}x</td>
-                        <td>{Number(sample.od600_calculated).toFixed(2)}</td>
+                        <td>{sample.od600_calculated != null ? Number(sample.od600_calculated).toFixed(2) : 'N/A'}</td>
                         <td>{sample.dcw_g_per_l ? Number(sample.dcw_g_per_l).toFixed(2) : 'N/A'}</td>
                         <td>
                           {sample.contamination_detected ? (
@@ -21,10 +21,11 @@ export interface Batch {
   status: 'pending' | 'running' | 'complete' | 'failed' | 'aborted';
   created_at: string;
   created_by?: string;
-  inoculated_at: string | null;
-  completed_at: string | null;
+  // Null fields are omitted by list endpoints, so these may also be absent
+  inoculated_at?: string | null;
+  completed_at?: string | null;
   operator_id: string;
-  notes: string | null;
+  notes?: string | null;
   // Computed fields (optional, may not always be provided)
   current_timepoint_hours?: number | null;
   total_samples_count?: number;
@@ -53,8 +54,8 @@ export interface Calibration {
   calibrated_by: string;
   calibrated_at: string;
   notes: string | null;
-  // Computed field for pH - can be string or number from API
-  slope_percent: number | string | null;
+  // Computed field for pH - can be string or number from API; omitted when null
+  slope_percent?: number | string | null;
 }
 
 export interface CalibrationCreate {
@@ -144,13 +145,13 @@ export interface Sample {
   id: number;
   batch_id: string; // UUID
   sampled_at: string;
-  timepoint_hours: number | string;
+  timepoint_hours?: number | string | null; // Omitted when null
   od600_raw: number | string;
   od600_dilution_factor: number | string;
-  od600_calculated: number | string;
-  dcw_g_per_l: number | string | null;
+  od600_calculated?: number | string | null; // Omitted when null
+  dcw_g_per_l?: number | string | null; // Omitted when null
   contamination_detected: boolean;
-  microscopy_observations: string | null;
+  microscopy_observations?: string | null;
   sampled_by: string;
 }
 
@@ -179,7 +180,7 @@ export interface Failure {
   corrective_action: string | null;
   reported_by: string;
   reviewed: boolean;
-  reviewed_by: string | null;
+  reviewed_by?: string | null; // Omitted when null
   reviewed_at: string | null;
 }
 